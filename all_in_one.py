@@ -24,11 +24,138 @@ All-in-One Sensor Logger for Raspberry Pi Pico W (MicroPython)
 """
 
 import time
-from machine import Pin, UART, I2C, SoftI2C, ADC
-from utime import ticks_ms, ticks_diff
+import uselect
+import ustruct
+import micropython
+from machine import Pin, UART, I2C, ADC
+from micropython import const
+from utime import ticks_ms, ticks_diff, ticks_add
+from array import array
 import dht
 
 
+# ============================================================================
+# 感應器輸出欄位索引
+# 每個感應器的 read() 回傳預先配置的 list 並就地更新，
+# 以固定位置索引取代每次配置新 dict + 字串鍵查找
+# ============================================================================
+
+# AD8232Sensor.read()
+ECG_VALUE = const(0)
+LEAD_OFF_PLUS = const(1)
+LEAD_OFF_MINUS = const(2)
+LEAD_OFF = const(3)
+
+# GSRSensor.read()
+GSR_VALUE = const(0)
+
+# MyowareSensor.read()
+MUSCLE_VALUE = const(0)
+MUSCLE_OK = const(1)
+MUSCLE_VOLTAGE = const(2)
+MUSCLE_REASON = const(3)
+
+# DHT22Sensor.read()
+ENV_TEMPERATURE = const(0)
+ENV_HUMIDITY = const(1)
+
+# MAX30205Sensor.read()
+BODY_TEMPERATURE = const(0)
+BODY_TEMP_FRESH = const(1)
+
+# MAX30102Sensor.read()
+HR_VALUE = const(0)
+SPO2_VALUE = const(1)
+IR_VALUE = const(2)
+HR_READY = const(3)
+
+# 設為 True 可輸出人類可讀的 JSON 幀（含控制台回顯）供除錯；
+# 預設輸出緊湊的二進位線路格式
+DEBUG = const(False)
+
+# JSON 布林欄位的預先配置位元組字面值，以 bool 索引：
+# _BOOL[x] 只需一次 tuple 索引，不用條件分支
+_BOOL = (b'false', b'true')
+
+# ========= 二進位線路格式 =========
+# 冗長的 JSON 在 115200 baud 的鏈路上每秒重複每個欄位名 10 次。
+# bin2 把所有值量化成整數：溫濕度以 centi 單位走 16 位元，線路上
+# （以及軟體浮點打包器裡）不再有任何 float。muscle_voltage 已移除
+# —— 它是 muscle_value 乘上常數，接收端可自行推導。
+#
+# 幀：sync(0xAA 0x55)、len u8（payload 位元組數）、payload、crc8。
+# Payload：ecg u16、gsr u16、muscle u16、env_temp i16 (cC)、
+# env_humidity u16 (c%)、body_temp i16 (cC)、hr u16、spo2 u8、
+# ir u32、flags u8
+_PAYLOAD_FMT = '<HHHhHhHBIB'
+_PAYLOAD_SIZE = ustruct.calcsize(_PAYLOAD_FMT)
+_FRAME_SIZE = _PAYLOAD_SIZE + 4  # sync(2) + len(1) + crc8(1)
+
+# flags 位元配置：bit0 lead_off_plus、bit1 lead_off_minus、
+# bit2 lead_off、bit3 muscle_ok、bit4 body_temp_fresh、
+# bits5-6 muscle_reason 代碼、bit7 hr_ready
+_REASON_CODE = {
+    'ok': 0,
+    'Normal': 0,
+    'saturated_high': 1,
+    'saturated_low': 2,
+    'flatline': 3,
+}
+
+# 一次性的 session 標頭，讓接收端能自我描述這些幀
+_SCHEMA_HDR = (
+    b'{"format": "bin2", "payload": "<HHHhHhHBIB", '
+    b'"frame": "AA 55, len, payload, crc8(poly 0x07)", '
+    b'"fields": ["ecg_value", "gsr_value", "muscle_value", '
+    b'"env_temperature_cC", "env_humidity_cPct", "body_temperature_cC", '
+    b'"hr_value", "spo2_value", "ir_value", "flags"]}\n'
+)
+
+
+def _crc8_table():
+    """在 import 時建立一次 CRC-8（多項式 0x07）查找表"""
+    table = bytearray(256)
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = ((c << 1) ^ 0x07 if c & 0x80 else c << 1) & 0xFF
+        table[i] = c
+    return bytes(table)
+
+
+_CRC8_TABLE = _crc8_table()
+
+
+def _crc8(buf, start, end):
+    """以預先計算的查找表求 buf[start:end] 的 CRC-8"""
+    table = _CRC8_TABLE
+    c = 0
+    for i in range(start, end):
+        c = table[c ^ buf[i]]
+    return c
+
+# BPM 計算保留的最近峰值時間戳數量
+_MAX_PEAKS = const(8)
+
+
+@micropython.viper
+def _ring_ptp(buf: ptr16, n: int) -> int:
+    """計算 buf 前 n 個項目的峰對峰值
+
+    由 viper 發射器編譯成原生 ARM 程式碼：25 個項目的暫存器掃描
+    比位元組碼的 max()+min() 兩趟走訪快得多，而且零配置。
+    """
+    lo = int(buf[0])
+    hi = lo
+    for i in range(1, n):
+        v = int(buf[i])
+        if v < lo:
+            lo = v
+        elif v > hi:
+            hi = v
+    return hi - lo
+
+
 # ============================================================================
 # HeartRateMonitor Class
 # ============================================================================
@@ -40,68 +167,149 @@ class HeartRateMonitor:
         self.sample_rate = sample_rate
         self.window_size = window_size
         self.smoothing_window = smoothing_window
-        self.samples = []
-        self.timestamps = []
-        self.filtered_samples = []
+        # 固定大小的環形緩衝區：寫入位置為 _head，有效樣本數為 _count，
+        # 取代 list 的 append + pop(0)（pop(0) 是 O(n) 且持續產生垃圾）
+        self.samples = array('i', [0] * window_size)
+        self.timestamps = array('i', [0] * window_size)
+        self.filtered_samples = array('i', [0] * window_size)
+        self._head = 0
+        self._count = 0
+        # 平滑窗口的滾動總和，讓平滑變成 O(1) 而非每次重新切片求和
+        self._smooth_sum = 0
+        # 單調遞增/遞減佇列，O(1) 取得窗口內的最小/最大值
+        self._min_dq = []
+        self._max_dq = []
+        self._seq = 0
+        # 增量峰值追蹤：記住前兩個平滑值（與中間那個的時間戳），
+        # 每個新樣本到達時即可判斷前一個樣本是否為局部峰值
+        self._prev1 = 0
+        self._prev2 = 0
+        self._prev1_ts = 0
+        self._peak_times = []
 
     def add_sample(self, sample):
         """添加新樣本到監測器"""
-        timestamp = ticks_ms()
-        self.samples.append(sample)
-        self.timestamps.append(timestamp)
-
-        # 應用平滑
-        if len(self.samples) >= self.smoothing_window:
-            smoothed_sample = sum(self.samples[-self.smoothing_window:]) / self.smoothing_window
-            self.filtered_samples.append(smoothed_sample)
-        else:
-            self.filtered_samples.append(sample)
+        self._ingest(sample, ticks_ms())
 
-        # 維持樣本和時間戳記的大小
-        if len(self.samples) > self.window_size:
-            self.samples.pop(0)
-            self.timestamps.pop(0)
-            self.filtered_samples.pop(0)
+    def add_samples(self, buf, n):
+        """一次呼叫餵入 buf 的前 n 個樣本
 
+        從感應器 FIFO 突發排空的樣本會同時到達，因此以採集週期
+        回推各自的時間戳，讓峰值間隔保持準確。
+        """
+        period = 1000 // self.sample_rate
+        timestamp = ticks_add(ticks_ms(), -(n - 1) * period)
+        ingest = self._ingest
+        for i in range(n):
+            ingest(buf[i], timestamp)
+            timestamp = ticks_add(timestamp, period)
+
+    @micropython.native
+    def _ingest(self, sample, timestamp):
+        """把一個樣本與其時間戳推入環形緩衝區（O(1)，無任何配置）"""
+        head = self._head
+        ws = self.window_size
+        sw = self.smoothing_window
+        samples = self.samples
+        n = self._count + 1
+
+        # 更新滾動總和：加入新樣本，移出離開平滑窗口的舊樣本
+        self._smooth_sum += sample
+        if n > sw:
+            self._smooth_sum -= samples[(head - sw) % ws]
+        if n >= sw:
+            smoothed = self._smooth_sum // sw
+        else:
+            smoothed = sample
+
+        # 更新單調佇列：移除被支配的尾端項目、加入新值、
+        # 當頭端項目離開窗口時將其移除
+        seq = self._seq
+        min_dq = self._min_dq
+        while min_dq and min_dq[-1][0] >= smoothed:
+            min_dq.pop()
+        min_dq.append((smoothed, seq))
+        if min_dq[0][1] <= seq - ws:
+            min_dq.pop(0)
+        max_dq = self._max_dq
+        while max_dq and max_dq[-1][0] <= smoothed:
+            max_dq.pop()
+        max_dq.append((smoothed, seq))
+        if max_dq[0][1] <= seq - ws:
+            max_dq.pop(0)
+        self._seq = seq + 1
+
+        # 增量峰值檢測：有了新樣本就能判斷前一個平滑值是否為峰值
+        if n >= 3:
+            p1 = self._prev1
+            min_v = min_dq[0][0]
+            threshold = min_v + ((max_dq[0][0] - min_v) >> 1)
+            if p1 > threshold and self._prev2 < p1 and p1 > smoothed:
+                peak_times = self._peak_times
+                peak_times.append(self._prev1_ts)
+                if len(peak_times) > _MAX_PEAKS:
+                    peak_times.pop(0)
+        self._prev2 = self._prev1
+        self._prev1 = smoothed
+        self._prev1_ts = timestamp
+
+        samples[head] = sample
+        self.timestamps[head] = timestamp
+        self.filtered_samples[head] = smoothed
+
+        self._head = (head + 1) % ws
+        if self._count < ws:
+            self._count = n
+
+    @micropython.native
     def find_peaks(self):
-        """在過濾後的樣本中找出峰值"""
+        """在過濾後的樣本中找出峰值（native 編譯的掃描循環）"""
         peaks = []
 
-        if len(self.filtered_samples) < 3:
+        count = self._count
+        if count < 3:
             return peaks
 
-        # 計算動態閾值
-        recent_samples = self.filtered_samples[-self.window_size:]
-        min_val = min(recent_samples)
-        max_val = max(recent_samples)
-        threshold = min_val + (max_val - min_val) * 0.5
-
-        for i in range(1, len(self.filtered_samples) - 1):
-            if (self.filtered_samples[i] > threshold and 
-                self.filtered_samples[i - 1] < self.filtered_samples[i] and 
-                self.filtered_samples[i] > self.filtered_samples[i + 1]):
-                peak_time = self.timestamps[i]
-                peaks.append((peak_time, self.filtered_samples[i]))
+        ws = self.window_size
+        filtered = self.filtered_samples
+        timestamps = self.timestamps
+        start = (self._head - count) % ws
+
+        # 從單調佇列以 O(1) 取得窗口極值來計算動態閾值；
+        # 純整數運算，避免 RP2040 上的軟體浮點模擬
+        min_val = self._min_dq[0][0]
+        max_val = self._max_dq[0][0]
+        threshold = min_val + ((max_val - min_val) >> 1)
+
+        # 以索引運算直接走訪環形緩衝區
+        prev = filtered[start]
+        cur = filtered[(start + 1) % ws]
+        for j in range(1, count - 1):
+            idx = (start + j) % ws
+            nxt = filtered[(start + j + 1) % ws]
+            if cur > threshold and prev < cur and cur > nxt:
+                peaks.append((timestamps[idx], cur))
+            prev = cur
+            cur = nxt
 
         return peaks
 
     def calculate_heart_rate(self):
-        """計算心率（BPM）"""
-        peaks = self.find_peaks()
+        """計算心率（BPM）
 
-        if len(peaks) < 2:
+        峰值在樣本到達時就已增量追蹤，因此這裡是 O(1)：
+        平均間隔直接由最早與最新的峰值時間戳求得。
+        """
+        peaks = self._peak_times
+        n = len(peaks)
+        if n < 2:
             return None
 
-        # 計算峰值間的平均間隔
-        intervals = []
-        for i in range(1, len(peaks)):
-            interval = ticks_diff(peaks[i][0], peaks[i - 1][0])
-            intervals.append(interval)
-
-        average_interval = sum(intervals) / len(intervals)
-        heart_rate = 60000 / average_interval
+        span = ticks_diff(peaks[-1], peaks[0])
+        if span <= 0:
+            return None
 
-        return heart_rate
+        return 60000 * (n - 1) / span
 
 
 # ============================================================================
@@ -115,20 +323,24 @@ class AD8232Sensor:
         self.ecg_adc = ADC(Pin(out_pin))
         self.lo_plus = Pin(lop_pin, Pin.IN)
         self.lo_minus = Pin(lon_pin, Pin.IN)
-    
+        # 一次性綁定硬體存取方法：read() 之後就是普通函式呼叫，
+        # 不用每個 tick 重新建立 bound method
+        self._read_u16 = self.ecg_adc.read_u16
+        self._lo_p_value = self.lo_plus.value
+        self._lo_n_value = self.lo_minus.value
+        # 預先配置的輸出欄位，每次 read() 就地更新
+        self._out = [0, False, False, False]
+
     def read(self):
-        """讀取 ECG 值和電極脫落狀態"""
-        ecg_value = self.ecg_adc.read_u16()
-        lo_p = bool(self.lo_plus.value())
-        lo_n = bool(self.lo_minus.value())
-        lo_any = lo_p or lo_n
-        
-        return {
-            'ecg_value': ecg_value,
-            'lead_off_plus': lo_p,
-            'lead_off_minus': lo_n,
-            'lead_off': lo_any
-        }
+        """讀取 ECG 值和電極脫落狀態（寫入輸出欄位）"""
+        out = self._out
+        out[ECG_VALUE] = self._read_u16()
+        lo_p = bool(self._lo_p_value())
+        lo_n = bool(self._lo_n_value())
+        out[LEAD_OFF_PLUS] = lo_p
+        out[LEAD_OFF_MINUS] = lo_n
+        out[LEAD_OFF] = lo_p or lo_n
+        return out
 
 
 # ============================================================================
@@ -140,10 +352,16 @@ class GSRSensor:
     
     def __init__(self, sig_pin):
         self.gsr_adc = ADC(Pin(sig_pin))
-    
+        # 一次性綁定存取方法，read() 免去每個 tick 的屬性查找
+        # 與 bound method 建立
+        self._read_u16 = self.gsr_adc.read_u16
+        # 預先配置的輸出欄位，每次 read() 就地更新
+        self._out = [0]
+
     def read(self):
-        """讀取 GSR 值"""
-        return {'gsr_value': self.gsr_adc.read_u16()}
+        """讀取 GSR 值（寫入輸出欄位）"""
+        self._out[GSR_VALUE] = self._read_u16()
+        return self._out
 
 
 # ============================================================================
@@ -159,51 +377,61 @@ class MyowareSensor:
     SAT_LOW_ADC = 200
     SAT_HIGH_V = 3.2
     MIN_PTP_ADC = 300
-    
+    # SAT_HIGH_V 換算成 ADC counts，在類別建立時與 SAT_HIGH_ADC 折疊，
+    # 飽和檢查因此只剩一次整數比較，不做每樣本的浮點轉換
+    SAT_HIGH_ADC_EFF = min(SAT_HIGH_ADC, int(SAT_HIGH_V / VREF * 65535))
+
     def __init__(self, sig_pin):
         self.myo_adc = ADC(Pin(sig_pin))
-        self._myo_buf = []
-    
-    def _adc_to_volt(self, adc):
-        """將 ADC 值轉換為電壓"""
-        return (float(adc) / 65535.0) * self.VREF
+        # 一次性綁定存取方法，read() 免去每個 tick 的屬性查找
+        # 與 bound method 建立
+        self._read_u16 = self.myo_adc.read_u16
+        # 預先計算的 counts->volts 係數：每次 read 一次浮點乘法，
+        # 不做除法加方法呼叫
+        self._adc_scale = self.VREF / 65535.0
+        # 平線檢查用的固定環形緩衝區：O(1) 寫入，
+        # 取代舊的 list append + pop(0) 平移
+        self._myo_buf = array('H', [0] * self.BUF_LEN)
+        self._head = 0
+        self._filled = 0
+        # 預先配置的輸出欄位，每次 read() 就地更新
+        self._out = [0, True, 0.0, 'Normal']
     
+    @micropython.native
     def _assess_myo_ok(self, adc_val):
-        """檢查 EMG 讀數是否有效"""
-        v = self._adc_to_volt(adc_val)
-        
+        """檢查 EMG 讀數是否有效（只用整數比較）"""
         # 1) 飽和或接地檢查
-        if adc_val >= self.SAT_HIGH_ADC or v >= self.SAT_HIGH_V:
+        if adc_val >= self.SAT_HIGH_ADC_EFF:
             return False, 'saturated_high'
         if adc_val <= self.SAT_LOW_ADC:
             return False, 'saturated_low'
         
-        # 2) 緩衝區更新
-        self._myo_buf.append(int(adc_val))
-        if len(self._myo_buf) > self.BUF_LEN:
-            self._myo_buf.pop(0)
-        
-        # 3) 平線檢查
-        if len(self._myo_buf) >= 8:
-            ptp = max(self._myo_buf) - min(self._myo_buf)
-            if ptp < self.MIN_PTP_ADC:
+        # 2) 緩衝區更新（環形寫入，不做平移）
+        buf_len = self.BUF_LEN
+        self._myo_buf[self._head] = int(adc_val)
+        self._head = (self._head + 1) % buf_len
+        if self._filled < buf_len:
+            self._filled += 1
+
+        # 3) 平線檢查：viper 掃描環形緩衝區已填入的部分
+        # （min/max 與樣本順序無關）
+        if self._filled >= 8:
+            if _ring_ptp(self._myo_buf, self._filled) < self.MIN_PTP_ADC:
                 return False, 'flatline'
-        
+
         return True, 'ok'
     
     def read(self):
-        """讀取 EMG 值並驗證"""
-        myo = self.myo_adc.read_u16()
+        """讀取 EMG 值並驗證（寫入輸出欄位）"""
+        myo = self._read_u16()
         myo_ok, myo_reason = self._assess_myo_ok(myo)
-        myo_out = myo if myo_ok else 0
-        myo_v = self._adc_to_volt(myo)
-        
-        return {
-            'muscle_value': myo_out,
-            'muscle_ok': myo_ok,
-            'muscle_voltage': myo_v,
-            'muscle_reason': myo_reason
-        }
+
+        out = self._out
+        out[MUSCLE_VALUE] = myo if myo_ok else 0
+        out[MUSCLE_OK] = myo_ok
+        out[MUSCLE_VOLTAGE] = myo * self._adc_scale
+        out[MUSCLE_REASON] = myo_reason
+        return out
 
 
 # ============================================================================
@@ -215,22 +443,22 @@ class DHT22Sensor:
     
     def __init__(self, dht_pin):
         self.dht_sensor = dht.DHT22(Pin(dht_pin))
-    
+        # 預先配置的輸出欄位，每次 read() 就地更新
+        self._out = [0.0, 0.0]
+
     def read(self):
-        """讀取溫度和濕度"""
+        """讀取溫度和濕度（寫入輸出欄位）"""
+        out = self._out
         try:
             self.dht_sensor.measure()
             env_t = self.dht_sensor.temperature()
             env_h = self.dht_sensor.humidity()
-            return {
-                'env_temperature': env_t if env_t is not None else 0.0,
-                'env_humidity': env_h if env_h is not None else 0.0
-            }
+            out[ENV_TEMPERATURE] = env_t if env_t is not None else 0.0
+            out[ENV_HUMIDITY] = env_h if env_h is not None else 0.0
         except:
-            return {
-                'env_temperature': 0.0,
-                'env_humidity': 0.0
-            }
+            out[ENV_TEMPERATURE] = 0.0
+            out[ENV_HUMIDITY] = 0.0
+        return out
 
 
 # ============================================================================
@@ -251,10 +479,17 @@ class MAX30205Sensor:
         self._prev_body_nonzero = None
         self._last_body = None
         self._last_body_ms = 0
-        
-        # 掃描感應器
+        # 讀取失敗時設置；恢復在下一個排程讀取的開頭執行，
+        # 不在失敗的那次讀取裡同步進行
+        self._needs_recovery = False
+        # 預先配置的輸出欄位，每次 read() 就地更新
+        self._out = [0.0, True]
+
+        # 掃描感應器：掃一次總線再做成員測試，不要每個候選位址
+        # 都探測全部 128 個位址
+        addrs = self.i2c.scan()
         for a in (0x48, 0x49, 0x4A, 0x4B, 0x4C, 0x4D, 0x4E, 0x4F):
-            if a in self.i2c.scan():
+            if a in addrs:
                 self.addr = a
                 break
     
@@ -284,34 +519,48 @@ class MAX30205Sensor:
         self.i2c = I2C(0, scl=Pin(self.scl_pin), sda=Pin(self.sda_pin), freq=self.freq)
     
     def read(self):
-        """讀取體溫（含重試和總線恢復）"""
+        """讀取體溫；失敗時把總線恢復延後到下一個 tick"""
+        out = self._out
         if self.addr is None:
-            return {'body_temperature': 0.0, 'body_temp_fresh': False}
-        
-        for attempt in range(6):
+            out[BODY_TEMPERATURE] = 0.0
+            out[BODY_TEMP_FRESH] = False
+            return out
+
+        # 延遲的總線恢復：重新初始化的成本在新的 1 Hz tick 開頭
+        # 支付，不在剛失敗的那個 tick 裡
+        if self._needs_recovery:
+            self._needs_recovery = False
+            self._bus_recovery()
+
+        # 兩次快速重試把最壞情況限制在約 2 ms；失敗的交換會立即
+        # 顯現，長時間退避沒有意義
+        for attempt in range(2):
             try:
-                self.i2c.writeto(self.addr, b'\x00')
-                time.sleep_us(60)
-                raw = self.i2c.readfrom(self.addr, 2)
+                # readfrom_mem 以 repeated-start 一次完成指標寫入與
+                # 讀取，由硬體排程，不需要中間的 sleep
+                raw = self.i2c.readfrom_mem(self.addr, 0x00, 2)
                 val = self._twos_comp16((raw[0] << 8) | raw[1]) / 256.0
-                
+
                 # 擴展數據格式補償 +64°C
                 if val < -10.0 and (0.0 <= val + 64.0 <= 100.0):
                     val += 64.0
-                
+
                 self._last_body = val
                 self._last_body_ms = time.ticks_ms()
-                
+
                 # 更新非零值
                 if val != 0 and val != 0.0:
                     self._prev_body_nonzero = val
-                
-                return {'body_temperature': val, 'body_temp_fresh': True}
+
+                out[BODY_TEMPERATURE] = val
+                out[BODY_TEMP_FRESH] = True
+                return out
             except:
-                time.sleep_ms(5 + attempt * 5)
-                if attempt == 2:
-                    self._bus_recovery()
-        
+                time.sleep_us(200)
+
+        # 兩次重試都失敗：標記總線，下一個 tick 再恢復
+        self._needs_recovery = True
+
         # 所有嘗試失敗：返回保持值
         if self._last_body is not None and time.ticks_diff(time.ticks_ms(), self._last_body_ms) <= self.HOLD_MS:
             body_t_out = self._last_body
@@ -320,7 +569,9 @@ class MAX30205Sensor:
         else:
             body_t_out = 0.0
         
-        return {'body_temperature': body_t_out, 'body_temp_fresh': False}
+        out[BODY_TEMPERATURE] = body_t_out
+        out[BODY_TEMP_FRESH] = False
+        return out
 
 
 # ============================================================================
@@ -351,7 +602,14 @@ class MAX30102Sensor:
         self._hr_calc_interval = 2000  # 2 秒（毫秒）
         self._current_hr = 0
         self._current_ir = 0
-        
+
+        # 預先配置的 FIFO 排空緩衝區（感應器 FIFO 容量為 32 個樣本）
+        self._red_buf = array('i', [0] * 32)
+        self._ir_buf = array('i', [0] * 32)
+
+        # 預先配置的輸出欄位，每次 read() 就地更新
+        self._out = [0, 98, 0, False]
+
         self._setup_sensor(MAX30105_PULSE_AMP_MEDIUM)
     
     def _setup_sensor(self, pulse_amp):
@@ -388,44 +646,41 @@ class MAX30102Sensor:
         spo2 = 0
         
         try:
-            # 重要：檢查並處理 FIFO 中的所有可用樣本
-            self.sensor.check()
-            
-            # 處理所有可用樣本（對於連續監測至關重要）
-            sample_count = 0
-            while self.sensor.available():
-                red = self.sensor.pop_red_from_storage()
-                ir = self.sensor.pop_ir_from_storage()
-                
+            # 重要：以一次 I2C 突發排空 FIFO 中的所有可用樣本，
+            # 不再每個樣本各做一次暫存器往返
+            sample_count = self.sensor.check_burst(self._red_buf, self._ir_buf)
+            if sample_count:
                 # 儲存最新的 IR 值用於輸出
-                self._current_ir = ir
-                
-                # 添加 IR 樣本到心率監測器（持續餵送）
-                self.hr_monitor.add_sample(ir)
-                sample_count += 1
-            
+                self._current_ir = self._ir_buf[sample_count - 1]
+
+                # 把整批樣本一次餵給心率監測器（持續餵送）
+                self.hr_monitor.add_samples(self._ir_buf, sample_count)
+
+
             # 週期性計算心率（每 2 秒）
             current_time = ticks_ms()
             if ticks_diff(current_time, self._last_hr_calc_time) >= self._hr_calc_interval:
                 calculated_hr = self.hr_monitor.calculate_heart_rate()
-                
-                # 調試輸出
-                samples_count = len(self.hr_monitor.samples)
-                print(f"[MAX30102] Samples: {samples_count}, Calculated HR: {calculated_hr}, Current HR: {self._current_hr}, IR: {self._current_ir}")
-                
+
+                # 調試輸出：DEBUG 是 const()，關閉時編譯器會把整個
+                # 分支連同 f-string 格式化與阻塞的 CDC 寫入一起消除
+                if DEBUG:
+                    samples_count = self.hr_monitor._count
+                    print(f"[MAX30102] Samples: {samples_count}, Calculated HR: {calculated_hr}, Current HR: {self._current_hr}, IR: {self._current_ir}")
+
                 if calculated_hr is not None:
                     hr = int(calculated_hr)
                     # 驗證心率範圍
                     if 20 <= hr <= 240:
                         self._current_hr = hr
-                        print(f"  ✓ Valid HR updated: {hr} BPM")
-                    else:
-                        print(f"  ✗ Invalid HR (out of range): {hr}")
+                        if DEBUG:
+                            print(f"  ✓ Valid HR updated: {hr} BPM")
+                    elif DEBUG:
                         # 如果超出範圍則保留先前的值
-                        pass
-                else:
+                        print(f"  ✗ Invalid HR (out of range): {hr}")
+                elif DEBUG:
                     print(f"  ✗ HR calculation returned None (need more samples)")
-                
+
                 # 更新計算時間
                 self._last_hr_calc_time = current_time
             
@@ -440,11 +695,16 @@ class MAX30102Sensor:
             print(f"MAX30102 read error: {e}")
             pass
         
-        return {
-            'hr_value': self._current_hr,
-            'spo2_value': spo2,
-            'ir_value': self._current_ir
-        }
+        # HR 至少需要兩個峰值才有意義；在那之前回報 0 並把
+        # hr_ready 設為 False，讓下游 UI 能顯示「暖機中」而不是垃圾值
+        hr_ready = len(self.hr_monitor._peak_times) >= 2
+
+        out = self._out
+        out[HR_VALUE] = self._current_hr if hr_ready else 0
+        out[SPO2_VALUE] = spo2
+        out[IR_VALUE] = self._current_ir
+        out[HR_READY] = hr_ready
+        return out
 
 
 # ============================================================================
@@ -459,7 +719,9 @@ class SensorManager:
         AD8232_OUT, AD8232_LOP, AD8232_LON = 28, 19, 18
         GSR_SIG, MYO_SIG, DHT_PIN = 26, 27, 21
         MX30102_SDA, MX30102_SCL = 16, 17
-        MX30205_SDA, MX30205_SCL, I2C0_FREQ = 4, 5, 50000
+        # MAX30205 支援 I2C fast-mode；400 kHz 讓每筆交易的總線時間
+        # 縮成四分之一（Grove 排線自帶上拉電阻）
+        MX30205_SDA, MX30205_SCL, I2C0_FREQ = 4, 5, 400000
         
         # ========= 初始化感應器 =========
         print("Initializing sensors...")
@@ -473,164 +735,232 @@ class SensorManager:
         self.dht_sensor = DHT22Sensor(DHT_PIN)
         
         # ========= 初始化 I2C 總線 =========
+        # 腳位 16/17 對應硬體 I2C(1)：由矽晶外設驅動總線時脈，
+        # 不用直譯器逐邊緣 bit-bang，對 MAX30102 的 FIFO 突發很重要
         self.i2c0 = I2C(0, scl=Pin(MX30205_SCL), sda=Pin(MX30205_SDA), freq=I2C0_FREQ)
-        self.i2c_soft = SoftI2C(sda=Pin(MX30102_SDA), scl=Pin(MX30102_SCL), freq=400000)
-        
+        self.i2c1 = I2C(1, scl=Pin(MX30102_SCL), sda=Pin(MX30102_SDA), freq=400000)
+
         # I2C 感應器
         self.temp_sensor = MAX30205Sensor(self.i2c0, MX30205_SCL, MX30205_SDA, I2C0_FREQ)
-        self.max30102_sensor = MAX30102Sensor(self.i2c_soft, sample_rate=400, fifo_average=8)
+        self.max30102_sensor = MAX30102Sensor(self.i2c1, sample_rate=400, fifo_average=8)
         
         # ========= 初始化 UART =========
-        self.uart = UART(0, baudrate=115200, tx=Pin(0), rx=Pin(1))
-        
-        # ========= 感應器更新間隔與最後值 =========
-        # 定義每個感應器的更新間隔（毫秒）
-        self.update_intervals = {
-            'ecg': 100,       # 10 Hz - ECG 波形需要高採樣率
-            'gsr': 100,       # 10 Hz - GSR 變化中等速度
-            'myo': 100,       # 10 Hz - 肌肉活動變化快速
-            'dht': 2000,      # 0.5 Hz - 溫濕度變化緩慢
-            'temp': 1000,     # 1 Hz - 體溫變化緩慢
-            'max30102': 100,  # 10 Hz - 但 HR 內部每 2 秒計算
-        }
-        
-        # 追蹤上次更新時間
-        self.last_update_times = {
-            'ecg': 0,
-            'gsr': 0,
-            'myo': 0,
-            'dht': 0,
-            'temp': 0,
-            'max30102': 0,
-        }
-        
-        # 儲存每個感應器的最後有效讀數
-        self.last_readings = {
-            'ecg': {'ecg_value': 0, 'lead_off_plus': False, 'lead_off_minus': False, 'lead_off': False},
-            'gsr': {'gsr_value': 0},
-            'myo': {'muscle_value': 0, 'muscle_ok': True, 'muscle_voltage': 0.0, 'muscle_reason': 'Normal'},
-            'dht': {'env_temperature': 0.0, 'env_humidity': 0.0},
-            'temp': {'body_temperature': 0.0, 'body_temp_fresh': True},
-            'max30102': {'hr_value': 0, 'spo2_value': 98, 'ir_value': 0},
-        }
+        # txbuf=2048 讓驅動程式有足夠的環形緩衝區，uart.write 只做
+        # 記憶體複製、由 IRQ 在背景送出，不會因 32 位元組的硬體
+        # FIFO 塞滿而讓主循環忙等
+        self.uart = UART(0, baudrate=115200, tx=Pin(0), rx=Pin(1), txbuf=2048)
+        # POLLOUT 表示驅動緩衝區還有空間；每次送出前以零逾時檢查，
+        # 連線停滯時不會卡住採樣循環
+        self._uart_poll = uselect.poll()
+        self._uart_poll.register(self.uart, uselect.POLLOUT)
         
+        # ========= 感應器排程 =========
+        # 一張表驅動 _dispatch：[next_due, interval_ms, read_fn, slot]。
+        # 項目是 list，到期時間可以就地更新；綁定的 read 方法在這裡
+        # 擷取一次。每個 slot 保存該感應器預先配置的輸出列表（由
+        # read() 就地更新），所以每個 tick 不會有任何配置，
+        # 也不再有以字串為鍵的 dict 查找
+        self._slots = [
+            self.ecg_sensor._out,
+            self.gsr_sensor._out,
+            self.myo_sensor._out,
+            self.dht_sensor._out,
+            self.temp_sensor._out,
+            self.max30102_sensor._out,
+        ]
+        self._sched = [
+            [0, 100, self.ecg_sensor.read, 0],      # 10 Hz - ECG 波形
+            [0, 100, self.gsr_sensor.read, 1],      # 10 Hz - GSR
+            [0, 100, self.myo_sensor.read, 2],      # 10 Hz - 肌肉活動
+            [0, 2000, self.dht_sensor.read, 3],     # 0.5 Hz - 溫濕度
+            [0, 1000, self.temp_sensor.read, 4],    # 1 Hz - 體溫
+            [0, 20, self.max30102_sensor.read, 5],  # 50 Hz - 排空 FIFO；HR 內部每 2 秒計算
+        ]
+
+        # ========= 持久化 TX 緩衝區 =========
+        # JSON 幀每次就地組裝到這個緩衝區，不再每 tick 配置
+        # 一個新 str 再 encode() 成另一份 bytes
+        self._tx = bytearray(512)
+        self._tx_mv = memoryview(self._tx)
+
+        # UART 幀是獨立的排程事件（10 Hz），與感應器輪詢頻率解耦
+        self._tx_next = 0
+        self._tx_interval = 100
+
         print("All sensors initialized successfully!")
+
+    def _put(self, pos, data):
+        """把 data 複製到輸出緩衝區 pos 位置，回傳新的 pos"""
+        end = pos + len(data)
+        self._tx[pos:end] = data
+        return end
     
-    def read_all(self):
-        """讀取所有感應器數據並返回 JSON 字串
-        
-        每個感應器以自己的更新間隔讀取。
-        如果未到更新時間，使用最後的有效讀數。
-        這允許不同的感應器以不同的頻率運行。
+    @micropython.native
+    def _dispatch(self, current_time):
+        """讀取所有到期的感應器
+
+        單趟表驅動掃描：到期的項目被派發後，其截止時間前推一個
+        間隔。每 tick 約 36 次 dict 查找變成約 12 次 list 索引。
         """
         try:
-            current_time = time.ticks_ms()
-            
-            # ========= ECG 感應器 (10 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['ecg']) >= self.update_intervals['ecg']:
-                self.last_readings['ecg'] = self.ecg_sensor.read()
-                self.last_update_times['ecg'] = current_time
-            ecg_data = self.last_readings['ecg']
-            
-            # ========= GSR 感應器 (10 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['gsr']) >= self.update_intervals['gsr']:
-                self.last_readings['gsr'] = self.gsr_sensor.read()
-                self.last_update_times['gsr'] = current_time
-            gsr_data = self.last_readings['gsr']
-            
-            # ========= Myoware 感應器 (10 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['myo']) >= self.update_intervals['myo']:
-                self.last_readings['myo'] = self.myo_sensor.read()
-                self.last_update_times['myo'] = current_time
-            myo_data = self.last_readings['myo']
-            
-            # ========= DHT22 感應器 (0.5 Hz - 每 2 秒) =========
-            if time.ticks_diff(current_time, self.last_update_times['dht']) >= self.update_intervals['dht']:
-                self.last_readings['dht'] = self.dht_sensor.read()
-                self.last_update_times['dht'] = current_time
-            dht_data = self.last_readings['dht']
-            
-            # ========= MAX30205 體溫感應器 (1 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['temp']) >= self.update_intervals['temp']:
-                self.last_readings['temp'] = self.temp_sensor.read()
-                self.last_update_times['temp'] = current_time
-            temp_data = self.last_readings['temp']
-            
-            # ========= MAX30102 心率感應器 (10 Hz 讀取, 0.5 Hz HR 計算) =========
-            # 注意：此感應器每 10Hz 讀取以持續處理 FIFO，
-            # 但心率在內部每 2 秒計算一次
-            if time.ticks_diff(current_time, self.last_update_times['max30102']) >= self.update_intervals['max30102']:
-                self.last_readings['max30102'] = self.max30102_sensor.read()
-                self.last_update_times['max30102'] = current_time
-            hr_data = self.last_readings['max30102']
-            
-            # 建立 JSON 字串（使用 format 以相容 MicroPython）
-            json_data = (
-                '{"ecg_value": %d, "gsr_value": %d, '
-                '"muscle_value": %d, "muscle_ok": %s, "muscle_voltage": %.3f, "muscle_reason": "%s", '
-                '"env_temperature": %.2f, "env_humidity": %.2f, '
-                '"body_temperature": %.2f, "body_temp_fresh": %s, '
-                '"hr_value": %d, "spo2_value": %d, "ir_value": %d, '
-                '"lead_off_plus": %s, "lead_off_minus": %s, "lead_off": %s}\n'
-            ) % (
-                ecg_data['ecg_value'],
-                gsr_data['gsr_value'],
-                myo_data['muscle_value'],
-                str(myo_data['muscle_ok']).lower(),
-                myo_data['muscle_voltage'],
-                myo_data['muscle_reason'],
-                dht_data['env_temperature'],
-                dht_data['env_humidity'],
-                temp_data['body_temperature'],
-                str(temp_data['body_temp_fresh']).lower(),
-                hr_data['hr_value'],
-                hr_data['spo2_value'],
-                hr_data['ir_value'],
-                str(ecg_data['lead_off_plus']).lower(),
-                str(ecg_data['lead_off_minus']).lower(),
-                str(ecg_data['lead_off']).lower()
-            )
-            
-            return json_data
-            
+            td = ticks_diff
+            ta = ticks_add
+            slots = self._slots
+            for e in self._sched:
+                if td(current_time, e[0]) >= 0:
+                    slots[e[3]] = e[2]()
+                    e[0] = ta(current_time, e[1])
         except Exception as e:
-            # 錯誤時返回 None，主循環會顯示 "No data"
-            print("Error in read_all(): %s" % str(e))
-            return None
-    
+            print("Error in _dispatch(): %s" % str(e))
+
+    def _next_deadline(self):
+        """計算感應器排程與 TX 事件中最早到期的時間點
+
+        排程表只有六個項目，線性掃描比 heap 的簿記開銷更划算。
+        """
+        td = ticks_diff
+        nxt = self._tx_next
+        for e in self._sched:
+            if td(e[0], nxt) < 0:
+                nxt = e[0]
+        return nxt
+
+    @micropython.native
+    def _encode_frame(self):
+        """從最後讀數就地組出 JSON 幀，回傳幀長度（錯誤時為 0）"""
+        try:
+            slots = self._slots
+            ecg_data = slots[0]
+            gsr_data = slots[1]
+            myo_data = slots[2]
+            dht_data = slots[3]
+            temp_data = slots[4]
+            hr_data = slots[5]
+
+            if not DEBUG:
+                # 固定結構的二進位幀：同樣的數據只占 24 位元組而不是
+                # ~300 字元的 JSON，打包進持久化緩衝區。payload 全為
+                # 整數；溫濕度以 centi 單位傳送
+                flags = ((1 if ecg_data[LEAD_OFF_PLUS] else 0) |
+                         (2 if ecg_data[LEAD_OFF_MINUS] else 0) |
+                         (4 if ecg_data[LEAD_OFF] else 0) |
+                         (8 if myo_data[MUSCLE_OK] else 0) |
+                         (16 if temp_data[BODY_TEMP_FRESH] else 0) |
+                         (_REASON_CODE.get(myo_data[MUSCLE_REASON], 0) << 5) |
+                         (128 if hr_data[HR_READY] else 0))
+                tx = self._tx
+                tx[0] = 0xAA
+                tx[1] = 0x55
+                tx[2] = _PAYLOAD_SIZE
+                ustruct.pack_into(
+                    _PAYLOAD_FMT, tx, 3,
+                    ecg_data[ECG_VALUE],
+                    gsr_data[GSR_VALUE],
+                    myo_data[MUSCLE_VALUE],
+                    int(dht_data[ENV_TEMPERATURE] * 100),
+                    int(dht_data[ENV_HUMIDITY] * 100),
+                    int(temp_data[BODY_TEMPERATURE] * 100),
+                    hr_data[HR_VALUE],
+                    hr_data[SPO2_VALUE],
+                    hr_data[IR_VALUE],
+                    flags
+                )
+                tx[3 + _PAYLOAD_SIZE] = _crc8(tx, 3, 3 + _PAYLOAD_SIZE)
+                return _FRAME_SIZE
+
+            # 將 JSON 幀直接組裝到持久化緩衝區：
+            # 固定的鍵名片段是 bytes 字面值，只有數值欄位經過小型格式化
+            put = self._put
+            pos = put(0, b'{"ecg_value": ')
+            pos = put(pos, b'%d' % ecg_data[ECG_VALUE])
+            pos = put(pos, b', "gsr_value": ')
+            pos = put(pos, b'%d' % gsr_data[GSR_VALUE])
+            pos = put(pos, b', "muscle_value": ')
+            pos = put(pos, b'%d' % myo_data[MUSCLE_VALUE])
+            pos = put(pos, b', "muscle_ok": ')
+            pos = put(pos, _BOOL[bool(myo_data[MUSCLE_OK])])
+            pos = put(pos, b', "muscle_voltage": ')
+            pos = put(pos, b'%.3f' % myo_data[MUSCLE_VOLTAGE])
+            pos = put(pos, b', "muscle_reason": "')
+            pos = put(pos, myo_data[MUSCLE_REASON].encode())
+            pos = put(pos, b'", "env_temperature": ')
+            pos = put(pos, b'%.2f' % dht_data[ENV_TEMPERATURE])
+            pos = put(pos, b', "env_humidity": ')
+            pos = put(pos, b'%.2f' % dht_data[ENV_HUMIDITY])
+            pos = put(pos, b', "body_temperature": ')
+            pos = put(pos, b'%.2f' % temp_data[BODY_TEMPERATURE])
+            pos = put(pos, b', "body_temp_fresh": ')
+            pos = put(pos, _BOOL[bool(temp_data[BODY_TEMP_FRESH])])
+            pos = put(pos, b', "hr_ready": ')
+            pos = put(pos, _BOOL[bool(hr_data[HR_READY])])
+            pos = put(pos, b', "hr_value": ')
+            pos = put(pos, b'%d' % hr_data[HR_VALUE])
+            pos = put(pos, b', "spo2_value": ')
+            pos = put(pos, b'%d' % hr_data[SPO2_VALUE])
+            pos = put(pos, b', "ir_value": ')
+            pos = put(pos, b'%d' % hr_data[IR_VALUE])
+            pos = put(pos, b', "lead_off_plus": ')
+            pos = put(pos, _BOOL[bool(ecg_data[LEAD_OFF_PLUS])])
+            pos = put(pos, b', "lead_off_minus": ')
+            pos = put(pos, _BOOL[bool(ecg_data[LEAD_OFF_MINUS])])
+            pos = put(pos, b', "lead_off": ')
+            pos = put(pos, _BOOL[bool(ecg_data[LEAD_OFF])])
+            pos = put(pos, b'}\n')
+
+            return pos
+
+        except Exception as e:
+            # 錯誤時返回 0，主循環會顯示 "No data"
+            print("Error in _encode_frame(): %s" % str(e))
+            return 0
+
     def run(self):
-        """主循環 - 以 10Hz 持續採集數據"""
+        """主循環 - 依截止時間排程採集數據
+
+        不再使用固定 100 ms 的超級循環：每輪睡到最早的感應器
+        （或 TX）截止時間。MAX30102 以 50 Hz 排空 FIFO，DHT22 以
+        0.5 Hz 讀取，中間不會有多餘的喚醒。
+        """
         print("\n" + "="*60)
         print("Starting sensor data acquisition...")
-        print("Sampling rate: 10 Hz (every 100ms)")
-        print("UART output: 115200 baud")
+        print("Scheduling: deadline-driven (per-sensor rates)")
+        print("UART output: 115200 baud, frame every 100ms")
         print("="*60 + "\n")
-        
-        # 初始化 MAX30102：在開始主循環前收集 5 秒樣本
-        print("Initializing MAX30102 heart rate monitor...")
-        print("Please place your finger on the MAX30102 sensor now.")
-        for i in range(50):  # 5 秒（10Hz）
-            self.read_all()
-            if i % 10 == 0:
-                print(f"  Collecting samples... {i//10 + 1}/5 seconds")
-            time.sleep_ms(100)
-        
-        print("Initialization complete! Starting main loop...")
+
+        # 先送一次線路格式宣告，讓接收端能同步
+        self.uart.write(_SCHEMA_HDR)
+
+        # 不做同步暖機：主循環從第一個 tick 就開始串流，
+        # hr_ready 在 HR 監測器看到足夠峰值前保持 False，
+        # 下游 UI 可以顯示「暖機中」狀態
+        print("Starting main loop (HR warms up in the background)...")
+        print("Please place your finger on the MAX30102 sensor.")
         print("Press Ctrl+C to stop.")
         print("="*60 + "\n")
-        
+
         while True:
-            data = self.read_all()
-            if data:
-                # 透過 UART 發送
-                self.uart.write(data.encode('utf-8'))
-                # 顯示到控制台
-                print(data.strip())
-            else:
-                print('No data')
-            
-            # 10Hz 採樣率
-            time.sleep_ms(100)
+            now = ticks_ms()
+            self._dispatch(now)
+
+            # TX 事件：每 100 ms 組一幀並送出
+            if ticks_diff(now, self._tx_next) >= 0:
+                self._tx_next = ticks_add(now, self._tx_interval)
+                n = self._encode_frame()
+                if n:
+                    # 只在驅動緩衝區有空間時送出；連線停滯時丟棄
+                    # 這一幀而不是卡住採樣循環
+                    if self._uart_poll.poll(0):
+                        self.uart.write(self._tx_mv[:n])
+                    if DEBUG:
+                        # 控制台回顯只對 JSON 幀有意義
+                        print(bytes(self._tx_mv[:n - 1]).decode())
+                else:
+                    print('No data')
+
+            # 睡到最早的下一個截止時間，而不是固定的 tick
+            dt = ticks_diff(self._next_deadline(), ticks_ms())
+            if dt > 0:
+                time.sleep_ms(dt)
 
 
 # ============================================================================
@@ -17,14 +17,14 @@ MYO_SIG = 27  # Myoware EMG signal pin
 # DHT22 Temperature/Humidity Sensor
 DHT_PIN = 21
 
-# MAX30102 (Heart Rate/SpO2) - SoftI2C
+# MAX30102 (Heart Rate/SpO2) - hardware I2C1 @ 400kHz
 MX30102_SDA = 16
 MX30102_SCL = 17
 
 # MAX30205 (Body Temperature) - I2C0
 MX30205_SDA = 4
 MX30205_SCL = 5
-I2C0_FREQ = 50000  # 50kHz for stability
+I2C0_FREQ = 400000  # fast-mode; MAX30205 supports up to 400kHz
 
 # UART Configuration
 UART_TX = 0
@@ -4,19 +4,104 @@
 # Modular Architecture - Each sensor is a separate class
 
 import time
-from machine import Pin, UART, I2C, SoftI2C
+import uselect
+import ustruct
+import micropython
+from machine import Pin, UART, I2C
+from micropython import const
 
-# Import all sensor classes from the sensors package
+# Module-level aliases: a global lookup is cheaper than an attribute
+# lookup into the time module on every call in the hot loop
+_ticks_ms = time.ticks_ms
+_ticks_diff = time.ticks_diff
+_ticks_add = time.ticks_add
+
+# Import all sensor classes and output slot indices from the sensors package
 from sensors import (
     AD8232Sensor,
     GSRSensor,
     MyowareSensor,
     DHT22Sensor,
     MAX30205Sensor,
-    MAX30102Sensor
+    MAX30102Sensor,
+    ECG_VALUE, LEAD_OFF_PLUS, LEAD_OFF_MINUS, LEAD_OFF,
+    GSR_VALUE,
+    MUSCLE_VALUE, MUSCLE_OK, MUSCLE_VOLTAGE, MUSCLE_REASON,
+    ENV_TEMPERATURE, ENV_HUMIDITY,
+    BODY_TEMPERATURE, BODY_TEMP_FRESH,
+    HR_VALUE, SPO2_VALUE, IR_VALUE, HR_READY
+)
+
+# Set True to emit human-readable JSON frames (and console echo) for
+# bring-up/debugging instead of the compact binary wire format
+DEBUG = const(False)
+
+# Pre-interned JSON literals for boolean fields, indexed by bool:
+# _BOOL[x] costs one tuple index instead of a conditional branch
+_BOOL = (b'false', b'true')
+
+# ========= Binary wire format =========
+# Verbose JSON repeats every field name 10x per second over a 115200 baud
+# link (~11 kB/s usable). The steady-state frame is instead a fixed-schema
+# packed struct; the field names travel once in the session header below.
+#
+# bin2 quantizes everything to integers: temperatures and humidity travel
+# as centi-units in 16 bits, so no float ever crosses the wire (or the
+# softfloat packer). muscle_voltage was dropped — it is muscle_value
+# times a constant, so the receiver can derive it.
+#
+# Frame: sync(0xAA 0x55), len u8 (payload bytes), payload, crc8.
+# Payload: ecg u16, gsr u16, muscle u16, env_temp i16 (cC),
+# env_humidity u16 (c%), body_temp i16 (cC), hr u16, spo2 u8,
+# ir u32, flags u8
+_PAYLOAD_FMT = '<HHHhHhHBIB'
+_PAYLOAD_SIZE = ustruct.calcsize(_PAYLOAD_FMT)
+_FRAME_SIZE = _PAYLOAD_SIZE + 4  # sync(2) + len(1) + crc8(1)
+
+# flags bit assignments: bit0 lead_off_plus, bit1 lead_off_minus,
+# bit2 lead_off, bit3 muscle_ok, bit4 body_temp_fresh,
+# bits5-6 muscle_reason code, bit7 hr_ready
+_REASON_CODE = {
+    'ok': 0,
+    'Normal': 0,
+    'saturated_high': 1,
+    'saturated_low': 2,
+    'flatline': 3,
+}
+
+# One-shot session header so the receiver can self-describe the frames
+_SCHEMA_HDR = (
+    b'{"format": "bin2", "payload": "<HHHhHhHBIB", '
+    b'"frame": "AA 55, len, payload, crc8(poly 0x07)", '
+    b'"fields": ["ecg_value", "gsr_value", "muscle_value", '
+    b'"env_temperature_cC", "env_humidity_cPct", "body_temperature_cC", '
+    b'"hr_value", "spo2_value", "ir_value", "flags"]}\n'
 )
 
 
+def _crc8_table():
+    """Build the CRC-8 (poly 0x07) lookup table once at import."""
+    table = bytearray(256)
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = ((c << 1) ^ 0x07 if c & 0x80 else c << 1) & 0xFF
+        table[i] = c
+    return bytes(table)
+
+
+_CRC8_TABLE = _crc8_table()
+
+
+def _crc8(buf, start, end):
+    """CRC-8 over buf[start:end] via the precomputed table."""
+    table = _CRC8_TABLE
+    c = 0
+    for i in range(start, end):
+        c = table[c ^ buf[i]]
+    return c
+
+
 class SensorManager:
     """Manages all sensors and coordinates data collection."""
     
@@ -25,7 +110,9 @@ class SensorManager:
         AD8232_OUT, AD8232_LOP, AD8232_LON = 28, 19, 18
         GSR_SIG, MYO_SIG, DHT_PIN = 26, 27, 21
         MX30102_SDA, MX30102_SCL = 16, 17
-        MX30205_SDA, MX30205_SCL, I2C0_FREQ = 4, 5, 50000
+        # MAX30205 supports I2C fast-mode; 400 kHz quarters its bus time
+        # per transaction (Grove cables carry the pull-ups)
+        MX30205_SDA, MX30205_SCL, I2C0_FREQ = 4, 5, 400000
         
         # ========= Initialize Sensors =========
         print("Initializing sensors...")
@@ -39,164 +126,268 @@ class SensorManager:
         self.dht_sensor = DHT22Sensor(DHT_PIN)
         
         # ========= Initialize I2C Buses =========
+        # Pins 16/17 map to hardware I2C(1): the silicon peripheral clocks
+        # the bus instead of bit-banging every edge in the interpreter,
+        # which matters for the MAX30102 FIFO bursts
         self.i2c0 = I2C(0, scl=Pin(MX30205_SCL), sda=Pin(MX30205_SDA), freq=I2C0_FREQ)
-        self.i2c_soft = SoftI2C(sda=Pin(MX30102_SDA), scl=Pin(MX30102_SCL), freq=400000)
-        
+        self.i2c1 = I2C(1, scl=Pin(MX30102_SCL), sda=Pin(MX30102_SDA), freq=400000)
+
         # I2C sensors
         self.temp_sensor = MAX30205Sensor(self.i2c0, MX30205_SCL, MX30205_SDA, I2C0_FREQ)
-        self.max30102_sensor = MAX30102Sensor(self.i2c_soft, sample_rate=400, fifo_average=8)
+        self.max30102_sensor = MAX30102Sensor(self.i2c1, sample_rate=400, fifo_average=8)
         
         # ========= Initialize UART =========
-        self.uart = UART(0, baudrate=115200, tx=Pin(0), rx=Pin(1))
+        # txbuf=2048 gives the driver a ring buffer large enough for a
+        # whole frame batch, so uart.write only copies bytes and the IRQ
+        # drains them in the background instead of the loop busy-waiting
+        # on the 32-byte hardware FIFO
+        self.uart = UART(0, baudrate=115200, tx=Pin(0), rx=Pin(1), txbuf=2048)
+        # POLLOUT tells us the driver buffer has room; checked with a
+        # zero timeout before each flush so a stalled link can never
+        # block the sample loop
+        self._uart_poll = uselect.poll()
+        self._uart_poll.register(self.uart, uselect.POLLOUT)
         
-        # ========= Sensor Update Intervals & Last Values =========
-        # Define update intervals in milliseconds for each sensor
-        self.update_intervals = {
-            'ecg': 100,       # 10 Hz - high frequency for ECG waveform
-            'gsr': 100,       # 10 Hz - GSR changes moderately fast
-            'myo': 100,       # 10 Hz - muscle activity changes fast
-            'dht': 2000,      # 0.5 Hz - temp/humidity change slowly
-            'temp': 1000,     # 1 Hz - body temperature changes slowly
-            'max30102': 100,  # 10 Hz - but HR calculates every 2s internally
-        }
-        
-        # Track last update times
-        self.last_update_times = {
-            'ecg': 0,
-            'gsr': 0,
-            'myo': 0,
-            'dht': 0,
-            'temp': 0,
-            'max30102': 0,
-        }
-        
-        # Store last valid readings for each sensor
-        self.last_readings = {
-            'ecg': {'ecg_value': 0, 'lead_off_plus': False, 'lead_off_minus': False, 'lead_off': False},
-            'gsr': {'gsr_value': 0},
-            'myo': {'muscle_value': 0, 'muscle_ok': True, 'muscle_voltage': 0.0, 'muscle_reason': 'Normal'},
-            'dht': {'env_temperature': 0.0, 'env_humidity': 0.0},
-            'temp': {'body_temperature': 0.0, 'body_temp_fresh': True},
-            'max30102': {'hr_value': 0, 'spo2_value': 98, 'ir_value': 0},
-        }
+        # ========= Sensor Scheduling =========
+        # One table drives _dispatch: [next_due, interval_ms, read_fn, slot].
+        # Entries are lists so the deadline can be patched in place; the
+        # bound read methods are captured once here. Each slot holds the
+        # sensor's preallocated output list, mutated in place by read(),
+        # so nothing is allocated per tick.
+        self._slots = [
+            self.ecg_sensor._out,
+            self.gsr_sensor._out,
+            self.myo_sensor._out,
+            self.dht_sensor._out,
+            self.temp_sensor._out,
+            self.max30102_sensor._out,
+        ]
+        self._sched = [
+            [0, 100, self.ecg_sensor.read, 0],      # 10 Hz - ECG waveform
+            [0, 100, self.gsr_sensor.read, 1],      # 10 Hz - GSR
+            [0, 100, self.myo_sensor.read, 2],      # 10 Hz - muscle activity
+            [0, 2000, self.dht_sensor.read, 3],     # 0.5 Hz - temp/humidity
+            [0, 1000, self.temp_sensor.read, 4],    # 1 Hz - body temperature
+            [0, 20, self.max30102_sensor.read, 5],  # 50 Hz - FIFO drain; HR calc every 2s internally
+        ]
+        # The UART frame is its own scheduled event (10 Hz), decoupled
+        # from the sensor polling rates above
+        self._tx_next = 0
+        self._tx_interval = 100
         
+        # ========= Persistent TX frame buffer =========
+        # The JSON frame is assembled in-place here every tick instead of
+        # allocating a fresh str and a second utf-8 encoded copy of it
+        self._out = bytearray(512)
+        self._mv = memoryview(self._out)
+
+        # Double-buffered TX: frames accumulate here and go out in one
+        # uart.write per batch instead of one driver call per frame
+        self._tx_buf = bytearray(1280)
+        self._tx_mv = memoryview(self._tx_buf)
+        self._tx_n = 0
+        self._tx_frames = 0
+
         print("All sensors initialized successfully!")
-    
-    def read_all(self):
-        """Read all sensor data and return as JSON string.
-        
-        Each sensor is read at its own update interval.
-        If not time to update, the last valid reading is used.
-        This allows different sensors to run at different frequencies.
+
+    def _put(self, pos, data):
+        """Copy data into the output buffer at pos; returns the new pos."""
+        end = pos + len(data)
+        self._out[pos:end] = data
+        return end
+
+    @micropython.native
+    def _dispatch(self, now):
+        """Run every sensor whose deadline has come due.
+
+        Single table-driven pass; each dispatched entry's deadline is
+        pushed forward by its interval. This lets sensors run at
+        different frequencies without a fixed superloop tick.
+        """
+        # Hoist the ticks helpers into locals for the schedule pass
+        td = _ticks_diff
+        ta = _ticks_add
+        slots = self._slots
+        for e in self._sched:
+            if td(now, e[0]) >= 0:
+                slots[e[3]] = e[2]()
+                e[0] = ta(now, e[1])
+
+    def _next_deadline(self):
+        """Earliest upcoming deadline across the sensor table and TX.
+
+        A linear scan beats a heap here: the table has six entries, so
+        heap bookkeeping would cost more than it saves.
+        """
+        td = _ticks_diff
+        nxt = self._tx_next
+        for e in self._sched:
+            if td(e[0], nxt) < 0:
+                nxt = e[0]
+        return nxt
+
+    @micropython.native
+    def _encode_frame(self):
+        """Build the output frame in-place from the sensor slots.
+
+        The frame is assembled into the persistent self._out buffer;
+        returns the frame length in bytes, or 0 on error.
         """
         try:
-            current_time = time.ticks_ms()
-            
-            # ========= ECG Sensor (10 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['ecg']) >= self.update_intervals['ecg']:
-                self.last_readings['ecg'] = self.ecg_sensor.read()
-                self.last_update_times['ecg'] = current_time
-            ecg_data = self.last_readings['ecg']
-            
-            # ========= GSR Sensor (10 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['gsr']) >= self.update_intervals['gsr']:
-                self.last_readings['gsr'] = self.gsr_sensor.read()
-                self.last_update_times['gsr'] = current_time
-            gsr_data = self.last_readings['gsr']
-            
-            # ========= Myoware Sensor (10 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['myo']) >= self.update_intervals['myo']:
-                self.last_readings['myo'] = self.myo_sensor.read()
-                self.last_update_times['myo'] = current_time
-            myo_data = self.last_readings['myo']
-            
-            # ========= DHT22 Sensor (0.5 Hz - every 2 seconds) =========
-            if time.ticks_diff(current_time, self.last_update_times['dht']) >= self.update_intervals['dht']:
-                self.last_readings['dht'] = self.dht_sensor.read()
-                self.last_update_times['dht'] = current_time
-            dht_data = self.last_readings['dht']
-            
-            # ========= MAX30205 Temperature Sensor (1 Hz) =========
-            if time.ticks_diff(current_time, self.last_update_times['temp']) >= self.update_intervals['temp']:
-                self.last_readings['temp'] = self.temp_sensor.read()
-                self.last_update_times['temp'] = current_time
-            temp_data = self.last_readings['temp']
-            
-            # ========= MAX30102 Heart Rate Sensor (10 Hz read, 0.5 Hz HR calc) =========
-            # Note: This sensor is read at 10Hz to process FIFO continuously,
-            # but heart rate is calculated internally every 2 seconds
-            if time.ticks_diff(current_time, self.last_update_times['max30102']) >= self.update_intervals['max30102']:
-                self.last_readings['max30102'] = self.max30102_sensor.read()
-                self.last_update_times['max30102'] = current_time
-            hr_data = self.last_readings['max30102']
-            
-            # Build JSON string (using format for MicroPython compatibility)
-            json_data = (
-                '{"ecg_value": %d, "gsr_value": %d, '
-                '"muscle_value": %d, "muscle_ok": %s, "muscle_voltage": %.3f, "muscle_reason": "%s", '
-                '"env_temperature": %.2f, "env_humidity": %.2f, '
-                '"body_temperature": %.2f, "body_temp_fresh": %s, '
-                '"hr_value": %d, "spo2_value": %d, "ir_value": %d, '
-                '"lead_off_plus": %s, "lead_off_minus": %s, "lead_off": %s}\n'
-            ) % (
-                ecg_data['ecg_value'],
-                gsr_data['gsr_value'],
-                myo_data['muscle_value'],
-                str(myo_data['muscle_ok']).lower(),
-                myo_data['muscle_voltage'],
-                myo_data['muscle_reason'],
-                dht_data['env_temperature'],
-                dht_data['env_humidity'],
-                temp_data['body_temperature'],
-                str(temp_data['body_temp_fresh']).lower(),
-                hr_data['hr_value'],
-                hr_data['spo2_value'],
-                hr_data['ir_value'],
-                str(ecg_data['lead_off_plus']).lower(),
-                str(ecg_data['lead_off_minus']).lower(),
-                str(ecg_data['lead_off']).lower()
-            )
-            
-            return json_data
+            slots = self._slots
+            ecg_data = slots[0]
+            gsr_data = slots[1]
+            myo_data = slots[2]
+            dht_data = slots[3]
+            temp_data = slots[4]
+            hr_data = slots[5]
             
+            if not DEBUG:
+                # Fixed-schema binary frame: the same data in 24 bytes
+                # instead of ~300 chars of JSON, packed into the
+                # persistent buffer. Integer-only payload; temperatures
+                # and humidity ride as centi-units
+                flags = ((1 if ecg_data[LEAD_OFF_PLUS] else 0) |
+                         (2 if ecg_data[LEAD_OFF_MINUS] else 0) |
+                         (4 if ecg_data[LEAD_OFF] else 0) |
+                         (8 if myo_data[MUSCLE_OK] else 0) |
+                         (16 if temp_data[BODY_TEMP_FRESH] else 0) |
+                         (_REASON_CODE.get(myo_data[MUSCLE_REASON], 0) << 5) |
+                         (128 if hr_data[HR_READY] else 0))
+                out = self._out
+                out[0] = 0xAA
+                out[1] = 0x55
+                out[2] = _PAYLOAD_SIZE
+                ustruct.pack_into(
+                    _PAYLOAD_FMT, out, 3,
+                    ecg_data[ECG_VALUE],
+                    gsr_data[GSR_VALUE],
+                    myo_data[MUSCLE_VALUE],
+                    int(dht_data[ENV_TEMPERATURE] * 100),
+                    int(dht_data[ENV_HUMIDITY] * 100),
+                    int(temp_data[BODY_TEMPERATURE] * 100),
+                    hr_data[HR_VALUE],
+                    hr_data[SPO2_VALUE],
+                    hr_data[IR_VALUE],
+                    flags
+                )
+                out[3 + _PAYLOAD_SIZE] = _crc8(out, 3, 3 + _PAYLOAD_SIZE)
+                return _FRAME_SIZE
+
+            # Assemble the JSON frame directly into the persistent buffer.
+            # Fixed key segments are bytes literals; only the numeric
+            # fields go through a (small) per-field format
+            put = self._put
+            pos = put(0, b'{"ecg_value": ')
+            pos = put(pos, b'%d' % ecg_data[ECG_VALUE])
+            pos = put(pos, b', "gsr_value": ')
+            pos = put(pos, b'%d' % gsr_data[GSR_VALUE])
+            pos = put(pos, b', "muscle_value": ')
+            pos = put(pos, b'%d' % myo_data[MUSCLE_VALUE])
+            pos = put(pos, b', "muscle_ok": ')
+            pos = put(pos, _BOOL[bool(myo_data[MUSCLE_OK])])
+            pos = put(pos, b', "muscle_voltage": ')
+            pos = put(pos, b'%.3f' % myo_data[MUSCLE_VOLTAGE])
+            pos = put(pos, b', "muscle_reason": "')
+            pos = put(pos, myo_data[MUSCLE_REASON].encode())
+            pos = put(pos, b'", "env_temperature": ')
+            pos = put(pos, b'%.2f' % dht_data[ENV_TEMPERATURE])
+            pos = put(pos, b', "env_humidity": ')
+            pos = put(pos, b'%.2f' % dht_data[ENV_HUMIDITY])
+            pos = put(pos, b', "body_temperature": ')
+            pos = put(pos, b'%.2f' % temp_data[BODY_TEMPERATURE])
+            pos = put(pos, b', "body_temp_fresh": ')
+            pos = put(pos, _BOOL[bool(temp_data[BODY_TEMP_FRESH])])
+            pos = put(pos, b', "hr_ready": ')
+            pos = put(pos, _BOOL[bool(hr_data[HR_READY])])
+            pos = put(pos, b', "hr_value": ')
+            pos = put(pos, b'%d' % hr_data[HR_VALUE])
+            pos = put(pos, b', "spo2_value": ')
+            pos = put(pos, b'%d' % hr_data[SPO2_VALUE])
+            pos = put(pos, b', "ir_value": ')
+            pos = put(pos, b'%d' % hr_data[IR_VALUE])
+            pos = put(pos, b', "lead_off_plus": ')
+            pos = put(pos, _BOOL[bool(ecg_data[LEAD_OFF_PLUS])])
+            pos = put(pos, b', "lead_off_minus": ')
+            pos = put(pos, _BOOL[bool(ecg_data[LEAD_OFF_MINUS])])
+            pos = put(pos, b', "lead_off": ')
+            pos = put(pos, _BOOL[bool(ecg_data[LEAD_OFF])])
+            pos = put(pos, b'}\n')
+
+            return pos
+
         except Exception as e:
-            # Return None on error, will print "No data" in main loop
-            print("Error in read_all(): %s" % str(e))
-            return None
+            # Return 0 on error, will print "No data" in main loop
+            print("Error in _encode_frame(): %s" % str(e))
+            return 0
     
     def run(self):
-        """Main loop for continuous data acquisition at 10Hz."""
+        """Main loop: deadline-driven data acquisition.
+
+        Instead of a fixed 100 ms superloop tick, the loop sleeps until
+        the earliest sensor (or TX) deadline. The MAX30102 FIFO is
+        drained at 50 Hz while the DHT22 runs at 0.5 Hz with no wasted
+        wakeups in between.
+        """
         print("\n" + "="*60)
         print("Starting sensor data acquisition...")
-        print("Sampling rate: 10 Hz (every 100ms)")
-        print("UART output: 115200 baud")
+        print("Scheduling: deadline-driven (per-sensor rates)")
+        print("UART output: 115200 baud, frame every 100ms")
         print("="*60 + "\n")
         
-        # Initialize MAX30102: collect samples for 5 seconds before starting main loop
-        print("Initializing MAX30102 heart rate monitor...")
-        print("Please place your finger on the MAX30102 sensor now.")
-        for i in range(50):  # 5 seconds at 10Hz
-            self.read_all()
-            if i % 10 == 0:
-                print(f"  Collecting samples... {i//10 + 1}/5 seconds")
-            time.sleep_ms(100)
-        
-        print("Initialization complete! Starting main loop...")
+        # Announce the wire format once so the receiver can sync
+        self.uart.write(_SCHEMA_HDR)
+
+        # No synchronous warmup: the loop streams from the first tick and
+        # the hr_ready flag stays False until the HR monitor has seen
+        # enough peaks, so the host UI can show a "warming up" state
+        print("Starting main loop (HR warms up in the background)...")
+        print("Please place your finger on the MAX30102 sensor.")
         print("Press Ctrl+C to stop.")
         print("="*60 + "\n")
         
+        sleep_ms = time.sleep_ms
         while True:
-            data = self.read_all()
-            if data:
-                # Send via UART
-                self.uart.write(data.encode('utf-8'))
-                # Print to console
-                print(data.strip())
-            else:
-                print('No data')
-            
-            # 10Hz sampling rate
-            time.sleep_ms(100)
+            now = _ticks_ms()
+            self._dispatch(now)
+
+            # TX event: encode and enqueue one frame every 100 ms
+            if _ticks_diff(now, self._tx_next) >= 0:
+                self._tx_next = _ticks_add(now, self._tx_interval)
+                n = self._encode_frame()
+                if n:
+                    # Append the frame to the TX batch buffer; one
+                    # uart.write per ~5 frames (500 ms) amortizes the
+                    # per-call driver cost
+                    tx_n = self._tx_n
+                    if tx_n + n > len(self._tx_buf):
+                        # Link stalled long enough to fill the batch
+                        # buffer too: discard the pending batch rather
+                        # than block. The receiver resyncs on the
+                        # 0xAA 0x55 frame marker
+                        tx_n = 0
+                        self._tx_frames = 0
+                    self._tx_buf[tx_n:tx_n + n] = self._mv[:n]
+                    self._tx_n = tx_n + n
+                    self._tx_frames += 1
+                    if self._tx_frames >= 5 or self._tx_n >= 1024:
+                        # Flush only when the driver buffer has room so
+                        # a full txbuf can never stall the sample loop
+                        if self._uart_poll.poll(0):
+                            self.uart.write(self._tx_mv[:self._tx_n])
+                            self._tx_n = 0
+                            self._tx_frames = 0
+                    if DEBUG:
+                        # Console echo only makes sense for the JSON frames
+                        print(bytes(self._mv[:n - 1]).decode())
+                else:
+                    print('No data')
+
+            # Sleep to the earliest upcoming deadline instead of a
+            # fixed tick
+            dt = _ticks_diff(self._next_deadline(), _ticks_ms())
+            if dt > 0:
+                sleep_ms(dt)
 
 
 def main():
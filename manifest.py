@@ -0,0 +1,18 @@
+# Frozen-manifest for building the sensor logger into the Pico W firmware.
+#
+# Freezing moves the bytecode of the sensor modules into flash (XIP): boot
+# no longer parses the .py sources into RAM, and the code objects stop
+# occupying heap that the 10 Hz loop's GC would otherwise have to scan.
+#
+# Build (from a micropython checkout, this repo alongside it):
+#   make -C ports/rp2 BOARD=RPI_PICO_W \
+#       FROZEN_MANIFEST=/path/to/Plan65607-pico-w/manifest.py
+#
+# main.py deliberately stays on the filesystem so pin assignments and the
+# DEBUG switch can be changed without reflashing the firmware.
+
+include("$(PORT_DIR)/boards/manifest.py")
+
+package("sensors")
+package("max30102")
+module("config.py")
@@ -686,6 +686,43 @@ class MAX30102(object):
         else:
             return False
 
+    # Polls the sensor and drains the whole FIFO with a single I2C burst
+    def check_burst(self, red_buf, ir_buf):
+        # Fills the caller-provided arrays with up to len(red_buf) samples
+        # and returns how many were read. Reading number_of_samples *
+        # bytes-per-sample in one transaction replaces the per-sample I2C
+        # round-trip of check().
+        read_pointer = ord(self.get_read_pointer())
+        write_pointer = ord(self.get_write_pointer())
+
+        if read_pointer == write_pointer:
+            return 0
+
+        # Calculate the number of readings we need to get from sensor
+        number_of_samples = write_pointer - read_pointer
+
+        # Wrap condition (return to the beginning of 32 samples)
+        if number_of_samples < 0:
+            number_of_samples += 32
+        if number_of_samples > len(red_buf):
+            number_of_samples = len(red_buf)
+
+        # The FIFO data register re-reads from the FIFO on every byte, so
+        # one long read streams all the pending samples
+        read_mode = self._multi_led_read_mode
+        fifo_bytes = self.i2c_read_register(MAX30105_FIFO_DATA,
+                                            number_of_samples * read_mode)
+
+        to_int = self.fifo_bytes_to_int
+        for i in range(number_of_samples):
+            base = i * read_mode
+            if self._active_leds > 0:
+                red_buf[i] = to_int(fifo_bytes[base:base + 3])
+            if self._active_leds > 1:
+                ir_buf[i] = to_int(fifo_bytes[base + 3:base + 6])
+
+        return number_of_samples
+
     # Check for new data but give up after a certain amount of time
     def safe_check(self, max_time_to_check):
         mark_time = ticks_ms()
@@ -1,11 +1,11 @@
 # Sensors package
 from .heart_rate_monitor import HeartRateMonitor
-from .ad8232_sensor import AD8232Sensor
-from .gsr_sensor import GSRSensor
-from .myoware_sensor import MyowareSensor
-from .dht22_sensor import DHT22Sensor
-from .max30205_sensor import MAX30205Sensor
-from .max30102_sensor import MAX30102Sensor
+from .ad8232_sensor import AD8232Sensor, ECG_VALUE, LEAD_OFF_PLUS, LEAD_OFF_MINUS, LEAD_OFF
+from .gsr_sensor import GSRSensor, GSR_VALUE
+from .myoware_sensor import MyowareSensor, MUSCLE_VALUE, MUSCLE_OK, MUSCLE_VOLTAGE, MUSCLE_REASON
+from .dht22_sensor import DHT22Sensor, ENV_TEMPERATURE, ENV_HUMIDITY
+from .max30205_sensor import MAX30205Sensor, BODY_TEMPERATURE, BODY_TEMP_FRESH
+from .max30102_sensor import MAX30102Sensor, HR_VALUE, SPO2_VALUE, IR_VALUE, HR_READY
 
 __all__ = [
     'HeartRateMonitor',
@@ -14,5 +14,23 @@ __all__ = [
     'MyowareSensor',
     'DHT22Sensor',
     'MAX30205Sensor',
-    'MAX30102Sensor'
+    'MAX30102Sensor',
+    # Positional output slot indices
+    'ECG_VALUE',
+    'LEAD_OFF_PLUS',
+    'LEAD_OFF_MINUS',
+    'LEAD_OFF',
+    'GSR_VALUE',
+    'MUSCLE_VALUE',
+    'MUSCLE_OK',
+    'MUSCLE_VOLTAGE',
+    'MUSCLE_REASON',
+    'ENV_TEMPERATURE',
+    'ENV_HUMIDITY',
+    'BODY_TEMPERATURE',
+    'BODY_TEMP_FRESH',
+    'HR_VALUE',
+    'SPO2_VALUE',
+    'IR_VALUE',
+    'HR_READY',
 ]
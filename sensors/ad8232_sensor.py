@@ -4,26 +4,37 @@ ECG sensor with lead-off detection.
 """
 
 from machine import ADC, Pin
+from micropython import const
+
+# Positional slots in the list returned by AD8232Sensor.read()
+ECG_VALUE = const(0)
+LEAD_OFF_PLUS = const(1)
+LEAD_OFF_MINUS = const(2)
+LEAD_OFF = const(3)
 
 
 class AD8232Sensor:
     """AD8232 ECG sensor with lead-off detection."""
-    
+
     def __init__(self, out_pin, lop_pin, lon_pin):
         self.ecg_adc = ADC(Pin(out_pin))
         self.lo_plus = Pin(lop_pin, Pin.IN)
         self.lo_minus = Pin(lon_pin, Pin.IN)
-    
+        # Bind the hardware accessors once: each read() then makes plain
+        # function calls instead of re-creating bound methods per tick
+        self._read_u16 = self.ecg_adc.read_u16
+        self._lo_p_value = self.lo_plus.value
+        self._lo_n_value = self.lo_minus.value
+        # Preallocated output slots, mutated in place on every read()
+        self._out = [0, False, False, False]
+
     def read(self):
-        """Read ECG value and lead-off status."""
-        ecg_value = self.ecg_adc.read_u16()
-        lo_p = bool(self.lo_plus.value())
-        lo_n = bool(self.lo_minus.value())
-        lo_any = lo_p or lo_n
-        
-        return {
-            'ecg_value': ecg_value,
-            'lead_off_plus': lo_p,
-            'lead_off_minus': lo_n,
-            'lead_off': lo_any
-        }
+        """Read ECG value and lead-off status into the output slots."""
+        out = self._out
+        out[ECG_VALUE] = self._read_u16()
+        lo_p = bool(self._lo_p_value())
+        lo_n = bool(self._lo_n_value())
+        out[LEAD_OFF_PLUS] = lo_p
+        out[LEAD_OFF_MINUS] = lo_n
+        out[LEAD_OFF] = lo_p or lo_n
+        return out
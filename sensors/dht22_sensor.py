@@ -3,28 +3,56 @@ DHT22 Sensor Class
 Temperature and humidity sensor.
 """
 
+import _thread
+
 from machine import Pin
+from micropython import const
+from utime import sleep_ms
 import dht
 
+# Positional slots in the list returned by DHT22Sensor.read()
+ENV_TEMPERATURE = const(0)
+ENV_HUMIDITY = const(1)
+
 
 class DHT22Sensor:
-    """DHT22 temperature and humidity sensor."""
-    
+    """DHT22 temperature and humidity sensor.
+
+    measure() blocks for ~18 ms while bit-banging the one-wire protocol,
+    which would eat a fifth of the 100 ms tick budget on core 0. A worker
+    thread on core 1 does the blocking reads every 2 seconds and read()
+    only copies the cached values.
+    """
+
     def __init__(self, dht_pin):
         self.dht_sensor = dht.DHT22(Pin(dht_pin))
-    
+        # Preallocated output slots, mutated in place on every read()
+        self._out = [0.0, 0.0]
+        self._cached_t = 0.0
+        self._cached_h = 0.0
+        self._lock = _thread.allocate_lock()
+        _thread.start_new_thread(self._worker, ())
+
+    def _worker(self):
+        """Core-1 loop: blocking measure() into the cache every 2 s."""
+        sensor = self.dht_sensor
+        while True:
+            try:
+                sensor.measure()
+                env_t = sensor.temperature()
+                env_h = sensor.humidity()
+                with self._lock:
+                    self._cached_t = env_t if env_t is not None else 0.0
+                    self._cached_h = env_h if env_h is not None else 0.0
+            except:
+                # Keep the previous cached values on a failed read
+                pass
+            sleep_ms(2000)
+
     def read(self):
-        """Read temperature and humidity."""
-        try:
-            self.dht_sensor.measure()
-            env_t = self.dht_sensor.temperature()
-            env_h = self.dht_sensor.humidity()
-            return {
-                'env_temperature': env_t if env_t is not None else 0.0,
-                'env_humidity': env_h if env_h is not None else 0.0
-            }
-        except:
-            return {
-                'env_temperature': 0.0,
-                'env_humidity': 0.0
-            }
+        """Copy the cached temperature and humidity into the output slots."""
+        out = self._out
+        with self._lock:
+            out[ENV_TEMPERATURE] = self._cached_t
+            out[ENV_HUMIDITY] = self._cached_h
+        return out
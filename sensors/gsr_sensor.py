@@ -4,14 +4,24 @@ Grove GSR sensor for measuring galvanic skin response.
 """
 
 from machine import ADC, Pin
+from micropython import const
+
+# Positional slot in the list returned by GSRSensor.read()
+GSR_VALUE = const(0)
 
 
 class GSRSensor:
     """Grove GSR sensor."""
-    
+
     def __init__(self, sig_pin):
         self.gsr_adc = ADC(Pin(sig_pin))
-    
+        # Bind the accessor once so read() skips the per-tick
+        # attribute lookup and bound-method creation
+        self._read_u16 = self.gsr_adc.read_u16
+        # Preallocated output slot, mutated in place on every read()
+        self._out = [0]
+
     def read(self):
-        """Read GSR value."""
-        return {'gsr_value': self.gsr_adc.read_u16()}
+        """Read GSR value into the output slot."""
+        self._out[GSR_VALUE] = self._read_u16()
+        return self._out
@@ -3,7 +3,39 @@ HeartRateMonitor Class
 Heart rate monitor using moving window to smooth signal and find peaks.
 """
 
-from utime import ticks_diff, ticks_ms
+from array import array
+from utime import ticks_add, ticks_diff, ticks_ms
+
+import micropython
+from micropython import const
+
+# How many recent peak timestamps to keep for the BPM calculation
+_MAX_PEAKS = const(8)
+
+
+@micropython.viper
+def _find_peaks_v(buf: ptr32, n: int, thr: int, out: ptr32) -> int:
+    """Scan n samples in buf for local maxima above thr.
+
+    Emitted as native ARM code by the viper emitter, bypassing the
+    bytecode dispatcher for the hot comparison loop. The 3-sample window
+    rolls through registers (a, b, c), so each iteration does one ptr32
+    load instead of three. Peak indices are written into the
+    preallocated out array; returns the peak count.
+    """
+    k = 0
+    a = buf[0]
+    b = buf[1]
+    for i in range(1, n - 1):
+        c = buf[i + 1]
+        if b > thr:
+            if a < b:
+                if b > c:
+                    out[k] = i
+                    k += 1
+        a = b
+        b = c
+    return k
 
 
 class HeartRateMonitor:
@@ -13,65 +45,157 @@ class HeartRateMonitor:
         self.sample_rate = sample_rate
         self.window_size = window_size
         self.smoothing_window = smoothing_window
-        self.samples = []
-        self.timestamps = []
-        self.filtered_samples = []
+        # Preallocated ring buffers: O(1) writes with no heap churn.
+        # list.pop(0) shifts the whole list on every sample, which causes
+        # repeated reallocations and GC pauses on the Pico W heap.
+        self.samples = array('i', [0] * window_size)
+        self.timestamps = array('i', [0] * window_size)
+        self.filtered_samples = array('i', [0] * window_size)
+        self.head = 0
+        self.count = 0
+        # Running sum of the last smoothing_window raw samples, maintained
+        # incrementally so smoothing is O(1) instead of O(smoothing_window)
+        self._smoothing_sum = 0
+        # Monotonic deques of (value, seq) over the filtered samples so the
+        # window min/max are available in O(1) without rescanning the ring
+        self._min_dq = []
+        self._max_dq = []
+        self._seq = 0
+        # Scratch buffers for the viper peak scan: the ring is linearized
+        # into _scan_buf and peak indices come back in _peak_idx
+        self._scan_buf = array('i', [0] * window_size)
+        self._peak_idx = array('i', [0] * window_size)
+        # Incremental peak tracking: the last two filtered values (and the
+        # middle one's timestamp) let each new sample decide whether its
+        # predecessor was a peak, so BPM needs no window rescans
+        self._prev1 = 0
+        self._prev2 = 0
+        self._prev1_ts = 0
+        self._peak_times = []
 
     def add_sample(self, sample):
         """Add a new sample to the monitor."""
-        timestamp = ticks_ms()
-        self.samples.append(sample)
-        self.timestamps.append(timestamp)
-
-        # Apply smoothing
-        if len(self.samples) >= self.smoothing_window:
-            smoothed_sample = sum(self.samples[-self.smoothing_window:]) / self.smoothing_window
-            self.filtered_samples.append(smoothed_sample)
+        self._ingest(sample, ticks_ms())
+
+    def add_samples(self, buf, n):
+        """Ingest n samples from buf in one call.
+
+        Samples drained from the sensor FIFO in a burst all arrive at
+        once, so their timestamps are back-dated by the acquisition
+        period to keep peak intervals accurate.
+        """
+        period = 1000 // self.sample_rate
+        timestamp = ticks_add(ticks_ms(), -(n - 1) * period)
+        ingest = self._ingest
+        for i in range(n):
+            ingest(buf[i], timestamp)
+            timestamp = ticks_add(timestamp, period)
+
+    def _ingest(self, sample, timestamp):
+        """Push one sample with its timestamp into the ring buffers."""
+        head = self.head
+        window_size = self.window_size
+        sw = self.smoothing_window
+        samples = self.samples
+
+        # Apply smoothing via the incremental running sum
+        self._smoothing_sum += sample
+        n = self.count + 1  # samples seen, including this one
+        if n > sw:
+            # Evict the raw sample that just left the smoothing window
+            self._smoothing_sum -= samples[(head - sw) % window_size]
+        if n >= sw:
+            smoothed_sample = self._smoothing_sum // sw
         else:
-            self.filtered_samples.append(sample)
-
-        # Maintain the size of samples and timestamps
-        if len(self.samples) > self.window_size:
-            self.samples.pop(0)
-            self.timestamps.pop(0)
-            self.filtered_samples.pop(0)
+            smoothed_sample = sample
+
+        # Update the monotonic min/max deques: drop dominated tail entries,
+        # push the new value, and expire the head once it leaves the window
+        seq = self._seq
+        min_dq = self._min_dq
+        while min_dq and min_dq[-1][0] >= smoothed_sample:
+            min_dq.pop()
+        min_dq.append((smoothed_sample, seq))
+        if min_dq[0][1] <= seq - window_size:
+            min_dq.pop(0)
+        max_dq = self._max_dq
+        while max_dq and max_dq[-1][0] <= smoothed_sample:
+            max_dq.pop()
+        max_dq.append((smoothed_sample, seq))
+        if max_dq[0][1] <= seq - window_size:
+            max_dq.pop(0)
+        self._seq = seq + 1
+
+        # Incremental peak detection: with the new sample in hand we can
+        # decide whether the previous filtered sample was a local maximum
+        if n >= 3:
+            p1 = self._prev1
+            min_v = min_dq[0][0]
+            threshold = min_v + ((max_dq[0][0] - min_v) >> 1)
+            if p1 > threshold and self._prev2 < p1 and p1 > smoothed_sample:
+                peak_times = self._peak_times
+                peak_times.append(self._prev1_ts)
+                if len(peak_times) > _MAX_PEAKS:
+                    peak_times.pop(0)
+        self._prev2 = self._prev1
+        self._prev1 = smoothed_sample
+        self._prev1_ts = timestamp
+
+        # Write into the ring at the current head and advance
+        samples[head] = sample
+        self.timestamps[head] = timestamp
+        self.filtered_samples[head] = smoothed_sample
+        self.head = (head + 1) % window_size
+        if self.count < window_size:
+            self.count += 1
 
     def find_peaks(self):
         """Find peaks in the filtered samples."""
         peaks = []
 
-        if len(self.filtered_samples) < 3:
+        count = self.count
+        if count < 3:
             return peaks
 
-        # Calculate dynamic threshold
-        recent_samples = self.filtered_samples[-self.window_size:]
-        min_val = min(recent_samples)
-        max_val = max(recent_samples)
-        threshold = min_val + (max_val - min_val) * 0.5
-
-        for i in range(1, len(self.filtered_samples) - 1):
-            if (self.filtered_samples[i] > threshold and 
-                self.filtered_samples[i - 1] < self.filtered_samples[i] and 
-                self.filtered_samples[i] > self.filtered_samples[i + 1]):
-                peak_time = self.timestamps[i]
-                peaks.append((peak_time, self.filtered_samples[i]))
+        window_size = self.window_size
+        filtered = self.filtered_samples
+        start = (self.head - count) % window_size
+
+        # Calculate dynamic threshold from the running window extrema.
+        # Pure integer math: the RP2040 has no hardware FP, so a float
+        # multiply here would drag in softfloat emulation
+        min_val = self._min_dq[0][0]
+        max_val = self._max_dq[0][0]
+        threshold = min_val + ((max_val - min_val) >> 1)
+
+        # Linearize the ring so the viper loop can walk it with a ptr32
+        scan_buf = self._scan_buf
+        for i in range(count):
+            scan_buf[i] = filtered[(start + i) % window_size]
+
+        peak_idx = self._peak_idx
+        n_peaks = _find_peaks_v(scan_buf, count, threshold, peak_idx)
+        for k in range(n_peaks):
+            i = peak_idx[k]
+            peak_time = self.timestamps[(start + i) % window_size]
+            peaks.append((peak_time, scan_buf[i]))
 
         return peaks
 
     def calculate_heart_rate(self):
-        """Calculate heart rate in beats per minute (BPM)."""
-        peaks = self.find_peaks()
-
-        if len(peaks) < 2:
+        """Calculate heart rate in beats per minute (BPM).
+
+        Peaks are tracked incrementally as samples arrive, so this is
+        O(1): the average interval falls out of the first and last of
+        the rolling peak timestamps.
+        """
+        peaks = self._peak_times
+        n = len(peaks)
+        if n < 2:
             return None
 
-        # Calculate average interval between peaks
-        intervals = []
-        for i in range(1, len(peaks)):
-            interval = ticks_diff(peaks[i][0], peaks[i - 1][0])
-            intervals.append(interval)
-
-        average_interval = sum(intervals) / len(intervals)
-        heart_rate = 60000 / average_interval
+        span = ticks_diff(peaks[-1], peaks[0])
+        if span <= 0:
+            return None
 
-        return heart_rate
+        return 60000 * (n - 1) / span
@@ -3,10 +3,24 @@ MAX30102 Heart Rate and SpO2 Sensor Class
 Integrated heart rate and blood oxygen sensor with HeartRateMonitor.
 """
 
+from array import array
+
 from max30102 import MAX30102, MAX30105_PULSE_AMP_MEDIUM
+from micropython import const
 from .heart_rate_monitor import HeartRateMonitor
 from utime import ticks_ms, ticks_diff
 
+# Compile-time debug switch: with const() the MicroPython compiler
+# dead-code-eliminates the "if DEBUG:" branches entirely, so the f-string
+# formatting and blocking USB-serial writes cost nothing when disabled
+DEBUG = const(False)
+
+# Positional slots in the list returned by MAX30102Sensor.read()
+HR_VALUE = const(0)
+SPO2_VALUE = const(1)
+IR_VALUE = const(2)
+HR_READY = const(3)
+
 
 class MAX30102Sensor:
     """MAX30102 heart rate and SpO2 sensor with integrated HeartRateMonitor."""
@@ -24,12 +38,19 @@ class MAX30102Sensor:
             smoothing_window=5
         )
         
+        # Preallocated FIFO drain buffers (the sensor FIFO holds 32 samples)
+        self._red_buf = array('i', [0] * 32)
+        self._ir_buf = array('i', [0] * 32)
+
         # Heart rate calculation timer (calculate every 2 seconds)
         self._last_hr_calc_time = ticks_ms()
         self._hr_calc_interval = 2000  # 2 seconds in ms
         self._current_hr = 0
         self._current_ir = 0
-        
+
+        # Preallocated output slots, mutated in place on every read()
+        self._out = [0, 98, 0, False]
+
         self._setup_sensor()
     
     def _setup_sensor(self):
@@ -66,44 +87,39 @@ class MAX30102Sensor:
         spo2 = 0
         
         try:
-            # IMPORTANT: Check and process ALL available samples in FIFO
-            self.sensor.check()
-            
-            # Process all available samples (critical for continuous monitoring)
-            sample_count = 0
-            while self.sensor.available():
-                red = self.sensor.pop_red_from_storage()
-                ir = self.sensor.pop_ir_from_storage()
-                
+            # IMPORTANT: Drain ALL available samples from the FIFO in one
+            # I2C burst instead of one register round-trip per sample
+            sample_count = self.sensor.check_burst(self._red_buf, self._ir_buf)
+            if sample_count:
                 # Store latest IR value for output
-                self._current_ir = ir
-                
-                # Add IR sample to heart rate monitor (continuous feeding)
-                self.hr_monitor.add_sample(ir)
-                sample_count += 1
+                self._current_ir = self._ir_buf[sample_count - 1]
+
+                # Feed the whole batch to the heart rate monitor in a
+                # single call (continuous feeding)
+                self.hr_monitor.add_samples(self._ir_buf, sample_count)
             
             # Calculate heart rate periodically (every 2 seconds)
             current_time = ticks_ms()
             if ticks_diff(current_time, self._last_hr_calc_time) >= self._hr_calc_interval:
                 calculated_hr = self.hr_monitor.calculate_heart_rate()
-                
-                # Debug output
-                samples_count = len(self.hr_monitor.samples)
-                print(f"[MAX30102] Samples: {samples_count}, Calculated HR: {calculated_hr}, Current HR: {self._current_hr}, IR: {self._current_ir}")
-                
+
+                if DEBUG:
+                    samples_count = self.hr_monitor.count
+                    print(f"[MAX30102] Samples: {samples_count}, Calculated HR: {calculated_hr}, Current HR: {self._current_hr}, IR: {self._current_ir}")
+
                 if calculated_hr is not None:
                     hr = int(calculated_hr)
                     # Validate heart rate range
                     if 20 <= hr <= 240:
                         self._current_hr = hr
-                        print(f"  ✓ Valid HR updated: {hr} BPM")
-                    else:
-                        print(f"  ✗ Invalid HR (out of range): {hr}")
+                        if DEBUG:
+                            print(f"  ✓ Valid HR updated: {hr} BPM")
+                    elif DEBUG:
                         # Keep previous value if out of range
-                        pass
-                else:
+                        print(f"  ✗ Invalid HR (out of range): {hr}")
+                elif DEBUG:
                     print(f"  ✗ HR calculation returned None (need more samples)")
-                
+
                 # Update calculation time
                 self._last_hr_calc_time = current_time
             
@@ -118,8 +134,14 @@ class MAX30102Sensor:
             print(f"MAX30102 read error: {e}")
             pass
         
-        return {
-            'hr_value': self._current_hr,
-            'spo2_value': spo2,
-            'ir_value': self._current_ir
-        }
+        # HR needs at least two detected peaks before the BPM estimate
+        # means anything; until then report 0 with hr_ready False so the
+        # host UI can show a "warming up" state instead of garbage
+        hr_ready = len(self.hr_monitor._peak_times) >= 2
+
+        out = self._out
+        out[HR_VALUE] = self._current_hr if hr_ready else 0
+        out[SPO2_VALUE] = spo2
+        out[IR_VALUE] = self._current_ir
+        out[HR_READY] = hr_ready
+        return out
@@ -5,6 +5,11 @@ High-precision body temperature sensor with I2C interface.
 
 import time
 from machine import Pin, I2C
+from micropython import const
+
+# Positional slots in the list returned by MAX30205Sensor.read()
+BODY_TEMPERATURE = const(0)
+BODY_TEMP_FRESH = const(1)
 
 
 class MAX30205Sensor:
@@ -21,10 +26,17 @@ class MAX30205Sensor:
         self._prev_body_nonzero = None
         self._last_body = None
         self._last_body_ms = 0
+        # Set when a read fails; recovery runs at the start of the next
+        # scheduled read instead of synchronously inside the failing one
+        self._needs_recovery = False
+        # Preallocated output slots, mutated in place on every read()
+        self._out = [0.0, True]
         
-        # Scan for sensor
+        # Scan for sensor: one bus sweep, then membership tests - calling
+        # scan() inside the loop would probe all 128 addresses per candidate
+        addrs = self.i2c.scan()
         for a in (0x48, 0x49, 0x4A, 0x4B, 0x4C, 0x4D, 0x4E, 0x4F):
-            if a in self.i2c.scan():
+            if a in addrs:
                 self.addr = a
                 break
     
@@ -54,34 +66,49 @@ class MAX30205Sensor:
         self.i2c = I2C(0, scl=Pin(self.scl_pin), sda=Pin(self.sda_pin), freq=self.freq)
     
     def read(self):
-        """Read body temperature with retry and bus recovery."""
+        """Read body temperature; failures defer recovery to the next tick."""
+        out = self._out
         if self.addr is None:
-            return {'body_temperature': 0.0, 'body_temp_fresh': False}
-        
-        for attempt in range(6):
+            out[BODY_TEMPERATURE] = 0.0
+            out[BODY_TEMP_FRESH] = False
+            return out
+
+        # Deferred bus recovery: pay the reinit cost at the start of a
+        # fresh 1 Hz tick, never inside the tick that just failed
+        if self._needs_recovery:
+            self._needs_recovery = False
+            self._bus_recovery()
+
+        # Two quick retries bound the worst case to ~2 ms; a failed
+        # exchange shows up immediately, so long backoffs buy nothing
+        for attempt in range(2):
             try:
-                self.i2c.writeto(self.addr, b'\x00')
-                time.sleep_us(60)
-                raw = self.i2c.readfrom(self.addr, 2)
+                # readfrom_mem does the pointer write and the read in one
+                # repeated-start transaction scheduled by the hardware,
+                # with no sleep in between
+                raw = self.i2c.readfrom_mem(self.addr, 0x00, 2)
                 val = self._twos_comp16((raw[0] << 8) | raw[1]) / 256.0
-                
+
                 # Extended Data Format compensation +64°C
                 if val < -10.0 and (0.0 <= val + 64.0 <= 100.0):
                     val += 64.0
-                
+
                 self._last_body = val
                 self._last_body_ms = time.ticks_ms()
-                
+
                 # Update non-zero value
                 if val != 0 and val != 0.0:
                     self._prev_body_nonzero = val
-                
-                return {'body_temperature': val, 'body_temp_fresh': True}
+
+                out[BODY_TEMPERATURE] = val
+                out[BODY_TEMP_FRESH] = True
+                return out
             except:
-                time.sleep_ms(5 + attempt * 5)
-                if attempt == 2:
-                    self._bus_recovery()
-        
+                time.sleep_us(200)
+
+        # Both retries failed: flag the bus for recovery next tick
+        self._needs_recovery = True
+
         # All attempts failed: return held value
         if self._last_body is not None and time.ticks_diff(time.ticks_ms(), self._last_body_ms) <= self.HOLD_MS:
             body_t_out = self._last_body
@@ -90,4 +117,6 @@ class MAX30205Sensor:
         else:
             body_t_out = 0.0
         
-        return {'body_temperature': body_t_out, 'body_temp_fresh': False}
+        out[BODY_TEMPERATURE] = body_t_out
+        out[BODY_TEMP_FRESH] = False
+        return out
@@ -3,7 +3,36 @@ Myoware EMG Sensor Class
 EMG sensor with anomaly detection for muscle signal monitoring.
 """
 
+from array import array
+
 from machine import ADC, Pin
+import micropython
+from micropython import const
+
+# Positional slots in the list returned by MyowareSensor.read()
+MUSCLE_VALUE = const(0)
+MUSCLE_OK = const(1)
+MUSCLE_VOLTAGE = const(2)
+MUSCLE_REASON = const(3)
+
+
+@micropython.viper
+def _ring_ptp(buf: ptr16, n: int) -> int:
+    """Peak-to-peak over the first n entries of buf.
+
+    Compiled to native ARM by the viper emitter; a 25-entry register
+    scan is cheaper than maintaining monotonic deques in bytecode (and
+    allocates nothing, where the deques churned small tuples).
+    """
+    lo = int(buf[0])
+    hi = lo
+    for i in range(1, n):
+        v = int(buf[i])
+        if v < lo:
+            lo = v
+        elif v > hi:
+            hi = v
+    return hi - lo
 
 
 class MyowareSensor:
@@ -15,48 +44,58 @@ class MyowareSensor:
     SAT_LOW_ADC = 200
     SAT_HIGH_V = 3.2
     MIN_PTP_ADC = 300
+    # SAT_HIGH_V expressed in ADC counts, folded with SAT_HIGH_ADC at
+    # class-creation time so the saturation check is one integer compare
+    # instead of a per-sample float conversion
+    SAT_HIGH_ADC_EFF = min(SAT_HIGH_ADC, int(SAT_HIGH_V / VREF * 65535))
     
     def __init__(self, sig_pin):
         self.myo_adc = ADC(Pin(sig_pin))
-        self._myo_buf = []
-    
-    def _adc_to_volt(self, adc):
-        """Convert ADC value to voltage."""
-        return (float(adc) / 65535.0) * self.VREF
+        # Bind the accessor once so read() skips the per-tick
+        # attribute lookup and bound-method creation
+        self._read_u16 = self.myo_adc.read_u16
+        # Precomputed counts->volts factor: one float multiply per read
+        # instead of a divide plus a method call
+        self._adc_scale = self.VREF / 65535.0
+        # Fixed ring buffer for the flatline check: O(1) writes instead of
+        # the old append + pop(0) shifting of a Python list
+        self._buf = array('H', [0] * self.BUF_LEN)
+        self._head = 0
+        self._filled = 0
+        # Preallocated output slots, mutated in place on every read()
+        self._out = [0, True, 0.0, 'Normal']
     
     def _assess_myo_ok(self, adc_val):
-        """Check if EMG reading is valid."""
-        v = self._adc_to_volt(adc_val)
-        
+        """Check if EMG reading is valid. Integer compares only."""
         # 1) Saturation or ground check
-        if adc_val >= self.SAT_HIGH_ADC or v >= self.SAT_HIGH_V:
+        if adc_val >= self.SAT_HIGH_ADC_EFF:
             return False, 'saturated_high'
         if adc_val <= self.SAT_LOW_ADC:
             return False, 'saturated_low'
         
-        # 2) Buffer update
-        self._myo_buf.append(int(adc_val))
-        if len(self._myo_buf) > self.BUF_LEN:
-            self._myo_buf.pop(0)
-        
-        # 3) Flatline check
-        if len(self._myo_buf) >= 8:
-            ptp = max(self._myo_buf) - min(self._myo_buf)
-            if ptp < self.MIN_PTP_ADC:
+        # 2) Buffer update (ring write, no shifting)
+        buf_len = self.BUF_LEN
+        self._buf[self._head] = int(adc_val)
+        self._head = (self._head + 1) % buf_len
+        if self._filled < buf_len:
+            self._filled += 1
+
+        # 3) Flatline check: viper scan of the filled part of the ring
+        # (min/max don't care about sample order)
+        if self._filled >= 8:
+            if _ring_ptp(self._buf, self._filled) < self.MIN_PTP_ADC:
                 return False, 'flatline'
-        
+
         return True, 'ok'
     
     def read(self):
-        """Read EMG value with validation."""
-        myo = self.myo_adc.read_u16()
+        """Read EMG value with validation into the output slots."""
+        myo = self._read_u16()
         myo_ok, myo_reason = self._assess_myo_ok(myo)
-        myo_out = myo if myo_ok else 0
-        myo_v = self._adc_to_volt(myo)
-        
-        return {
-            'muscle_value': myo_out,
-            'muscle_ok': myo_ok,
-            'muscle_voltage': myo_v,
-            'muscle_reason': myo_reason
-        }
+
+        out = self._out
+        out[MUSCLE_VALUE] = myo if myo_ok else 0
+        out[MUSCLE_OK] = myo_ok
+        out[MUSCLE_VOLTAGE] = myo * self._adc_scale
+        out[MUSCLE_REASON] = myo_reason
+        return out